@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class Apis_ontologyProjectConfig(AppConfig):
     name = "apis_ontology"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from apis_ontology import signals  # noqa: F401
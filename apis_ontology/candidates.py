@@ -0,0 +1,59 @@
+from django.apps import apps as global_apps
+
+# the autocompletes backed by `AutocompleteCandidate`: the objects of the
+# relation that have a member as subject, with further filters on the relation
+CANDIDATE_RELATIONS = {
+    "geburtsort": ("geborenin", {}),
+    "sterbeort": ("gestorbenin", {}),
+    "ausbildung": (
+        "ausbildungan",
+        {"typ__in": ["Studium", "Promotion", "Habilitation"]},
+    ),
+    "institution_beruf": ("positionan", {}),
+    "wissenschaftsaustausch": ("wissenschaftsaustauschin", {}),
+}
+
+
+def candidate_ids(kind, apps=global_apps):
+    """the ids of the entities the autocomplete *kind* offers"""
+    model_name, filters = CANDIDATE_RELATIONS[kind]
+    members = apps.get_model("apis_ontology", "Person").objects.filter(mitglied=True)
+    return (
+        apps.get_model("apis_ontology", model_name)
+        .objects.filter(
+            subj_object_id__in=members.values("pk"),
+            obj_object_id__isnull=False,
+            **filters,
+        )
+        .order_by()
+        .values_list("obj_object_id", flat=True)
+    )
+
+
+def refresh_candidates(kind, object_ids=None, apps=global_apps):
+    """update the `AutocompleteCandidate` rows of the autocomplete *kind*
+
+    Only the entities among *object_ids* are checked, or all of them
+    without *object_ids*: rows that are no longer offered are removed and
+    the offered ones are added. *apps* allows the use in migrations.
+    """
+    AutocompleteCandidate = apps.get_model("apis_ontology", "AutocompleteCandidate")
+    eligible = candidate_ids(kind, apps)
+    stale = AutocompleteCandidate.objects.filter(kind=kind).exclude(
+        entity_id__in=eligible
+    )
+    if object_ids is not None:
+        stale = stale.filter(entity_id__in=object_ids)
+        eligible = eligible.filter(obj_object_id__in=object_ids)
+    stale.delete()
+    AutocompleteCandidate.objects.bulk_create(
+        [AutocompleteCandidate(kind=kind, entity_id=pk) for pk in eligible.distinct()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_candidates(apps=global_apps):
+    """store the `AutocompleteCandidate` rows of every autocomplete"""
+    for kind in CANDIDATE_RELATIONS:
+        refresh_candidates(kind, apps=apps)
@@ -0,0 +1,46 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from apis_ontology.name_variants import search_names
+from apis_ontology.search_index import person_search_queryset
+from mine_frontend.facets import count_facets
+from mine_frontend.views import PersonResultsView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the member search on the correlated subquery annotations "
+        "with the member search on PersonSearchIndex"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--query", default="", help="query string, e.g. 'membership=wM'"
+        )
+
+    def measure(self, view, queryset, runs):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            count_facets(
+                view.apply_non_facet_filters(queryset),
+                view.get_facet_fields(),
+                view.get_selected_facets(),
+            )
+            qs = view.apply_filters_except(queryset)
+            list(qs.order_by("surname", "forename")[:25])
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        view = PersonResultsView()
+        view.setup(RequestFactory().get(f"/search/?{options['query']}"))
+        subqueries = person_search_queryset().alias(search_name=search_names())
+        before = self.measure(view, subqueries, options["runs"])
+        after = self.measure(view, view.get_base_queryset(), options["runs"])
+        self.stdout.write(f"subqueries:        {before:8.1f} ms")
+        self.stdout.write(f"PersonSearchIndex: {after:8.1f} ms")
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.oefos import COMPILED, compile_oefos
+
+
+class Command(BaseCommand):
+    help = "Compile the OEFOS classification for the choices of Fach.oestat"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        tree = compile_oefos()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"compiled {len(tree['entries'])} entries to {COMPILED}"
+                f" in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import DataVersion, Preis
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored academy_prize flag of all prizes"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        changed = Preis.objects.refresh_academy_prize(None)
+        if changed:
+            DataVersion.objects.bump(DataVersion.ONTOLOGY)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"updated {len(changed)} prizes in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.candidates import rebuild_candidates
+from apis_ontology.models import AutocompleteCandidate, DataVersion
+
+
+class Command(BaseCommand):
+    help = "Rebuild the AutocompleteCandidate rows of the search autocompletes"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rebuild_candidates()
+        # the cached autocomplete responses offered the old candidates
+        DataVersion.objects.bump(DataVersion.ONTOLOGY)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"stored {AutocompleteCandidate.objects.count()} candidates"
+                f" in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,63 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import Person
+from mine_frontend.dossier import pending_dossiers, rebuild_dossiers
+
+
+class Command(BaseCommand):
+    """Rebuild the PersonDossier documents of the members.
+
+    There is no task queue in this project: saves only mark dossiers as
+    stale, and ``--watch`` running next to the web server stands in for a
+    worker rebuilding them. Until then `get_dossier` builds them on the fly.
+    """
+
+    help = "Rebuild the PersonDossier documents of the members"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help="only rebuild missing and stale dossiers",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="number of worker processes (default: number of CPUs)",
+        )
+        parser.add_argument(
+            "--watch",
+            type=float,
+            metavar="SECONDS",
+            help="keep running and rebuild stale dossiers every SECONDS",
+        )
+
+    def handle(self, *args, **options):
+        stale = options["stale"] or options["watch"] is not None
+        while True:
+            if stale:
+                person_ids = list(pending_dossiers())
+            else:
+                person_ids = list(
+                    Person.objects.filter(mitglied=True).values_list("pk", flat=True)
+                )
+            if person_ids or options["watch"] is None:
+                self.rebuild(person_ids, options["workers"])
+            if options["watch"] is None:
+                break
+            time.sleep(options["watch"])
+
+    def rebuild(self, person_ids, workers):
+        start = time.perf_counter()
+        rows = rebuild_dossiers(person_ids, workers=workers)
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"built {rows} dossiers in {seconds:.2f}s "
+                f"({rows / seconds if seconds else 0:.1f} dossiers/s)"
+            )
+        )
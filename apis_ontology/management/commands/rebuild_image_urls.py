@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import Bild
+from apis_ontology.signals import bump_entity_versions_on_commit
+
+
+class Command(BaseCommand):
+    help = "Store the signed thumbnail URLs and srcsets of all images"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        changed = []
+        for image in Bild.objects.only(
+            "pk", "pfad", "object_id", "thumb_url", "thumb_srcset"
+        ):
+            urls = image.signed_thumb_url(), image.signed_srcset()
+            if urls != (image.thumb_url, image.thumb_srcset):
+                image.thumb_url, image.thumb_srcset = urls
+                changed.append(image)
+        Bild.objects.bulk_update(
+            changed, ["thumb_url", "thumb_srcset"], batch_size=1000
+        )
+        # the cached detail pages and dossiers still show the old URLs
+        bump_entity_versions_on_commit(image.object_id for image in changed)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"updated {len(changed)} images in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import DataVersion, InstitutionClosure
+
+
+class Command(BaseCommand):
+    help = "Rebuild the InstitutionClosure of the institution hierarchy"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        InstitutionClosure.objects.refresh()
+        # the Klasse facet of the cached institution search reads the closure
+        DataVersion.objects.bump(DataVersion.ONTOLOGY)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"stored {InstitutionClosure.objects.count()} rows"
+                f" in {time.perf_counter() - start:.2f}s"
+            )
+        )
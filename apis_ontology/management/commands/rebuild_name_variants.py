@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import DataVersion
+from apis_ontology.name_variants import rebuild_name_variants
+
+
+class Command(BaseCommand):
+    help = "Rebuild the NameVariants used by the name search and autocompletes"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows = rebuild_name_variants()
+        # cached name searches and autocompletes matched the old variants
+        DataVersion.objects.bump(DataVersion.ONTOLOGY)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"indexed {rows} entities in {time.perf_counter() - start:.2f}s"
+            )
+        )
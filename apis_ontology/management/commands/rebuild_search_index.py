@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.search_index import refresh_person_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized PersonSearchIndex used by the member search"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows = refresh_person_search_index()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"indexed {rows} persons in {time.perf_counter() - start:.2f}s"
+            )
+        )
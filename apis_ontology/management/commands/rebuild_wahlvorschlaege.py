@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apis_ontology.models import DataVersion, Wahlvorschlag
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Wahlvorschlag rows from the proposers of the elections"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        Wahlvorschlag.objects.refresh()
+        # cached proposer filters and autocompletes read the proposals
+        DataVersion.objects.bump(DataVersion.ONTOLOGY)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"stored {Wahlvorschlag.objects.count()} proposals"
+                f" in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,224 @@
+# Generated by Django 5.2.11 on 2026-10-16 23:49
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+
+# frozen copies of the constants used by `apis_ontology.search_index`
+POSITIONEN_PRES = [
+    "Präsident(in)",
+    "Vizepräsident(in)",
+    "Generalsekretär(in)",
+    "Sekretär(in)",
+    "Präsident(in) Klasse",
+    "Sekretär(in) Klasse",
+]
+NOBELPREISE = [
+    "Nobelpreis für Chemie",
+    "Nobelpreis für Physik",
+    "Nobelpreis für Physiologie oder Medizin",
+    "Alfred-Nobel-Gedächtnispreis für Wirtschaftswissenschaften",
+    "Nobelpreis für Literatur",
+    "Friedensnobelpreis",
+]
+
+
+def populate(apps, schema_editor):
+    """the rows of `person_search_queryset`, with the historical models"""
+
+    def model(name):
+        return apps.get_model("apis_ontology", name)
+
+    Institution = model("Institution")
+    OeawMitgliedschaft = model("OeawMitgliedschaft")
+    PositionAn = model("PositionAn")
+    Gewinnt = model("Gewinnt")
+
+    def objects(relation, **filters):
+        return (
+            model(relation)
+            .objects.filter(subj_object_id=OuterRef("pk"), **filters)
+            .values_list("obj_object_id", flat=True)
+        )
+
+    memb_dates = OeawMitgliedschaft.objects.filter(subj_object_id=OuterRef("pk"))
+    academy = Institution.objects.filter(akademie_institution=True).values("pk")
+    nsdap = Institution.objects.filter(
+        label="Nationalsozialistische Deutsche Arbeiterpartei"
+    ).values("pk")
+    academy_prizes = model("WirdVergebenVon").objects.filter(obj_object_id__in=academy)
+    nobelpreise = model("Preis").objects.filter(name__in=NOBELPREISE).values("pk")
+    rows = (
+        model("Person")
+        .objects.filter(mitglied=True)
+        .order_by()
+        .annotate(
+            _memberships=ArraySubquery(memb_dates.values("mitgliedschaft").distinct()),
+            _acad_func=ArraySubquery(
+                PositionAn.objects.filter(
+                    subj_object_id=OuterRef("pk"),
+                    position__in=POSITIONEN_PRES,
+                    obj_object_id__in=Institution.objects.filter(typ="Klasse").values(
+                        "pk"
+                    ),
+                )
+                .values_list("position")
+                .distinct()
+            ),
+            _institute=ArraySubquery(
+                objects("PositionAn", obj_object_id__in=academy).distinct()
+            ),
+            _geburtsorte=ArraySubquery(objects("GeborenIn")),
+            _sterbeorte=ArraySubquery(objects("GestorbenIn")),
+            _ausbildunginst=ArraySubquery(
+                objects(
+                    "AusbildungAn", typ__in=["Studium", "Promotion", "Habilitation"]
+                )
+            ),
+            _akademiepreise=ArraySubquery(
+                objects(
+                    "Gewinnt",
+                    obj_object_id__in=academy_prizes.values("subj_object_id"),
+                )
+            ),
+            _wiss_austausch=ArraySubquery(objects("WissenschaftsaustauschIn")),
+            _min_date_memb=Subquery(
+                memb_dates.order_by("beginn_date_from").values("beginn_date_from")[:1]
+            ),
+            _max_date_memb=Subquery(
+                memb_dates.order_by("-ende_date_to").values("ende_date_to")[:1]
+            ),
+            _nsdap=Exists(
+                model("Mitglied").objects.filter(
+                    subj_object_id=OuterRef("pk"), obj_object_id=Subquery(nsdap[:1])
+                )
+            ),
+            _nobelpreis=Exists(
+                Gewinnt.objects.filter(
+                    subj_object_id=OuterRef("pk"), obj_object_id__in=nobelpreise
+                )
+            ),
+        )
+    )
+    fields = [
+        "memberships",
+        "acad_func",
+        "institute",
+        "geburtsorte",
+        "sterbeorte",
+        "ausbildunginst",
+        "akademiepreise",
+        "wiss_austausch",
+        "min_date_memb",
+        "max_date_memb",
+        "nsdap",
+        "nobelpreis",
+    ]
+    model("PersonSearchIndex").objects.bulk_create(
+        [
+            model("PersonSearchIndex")(
+                person_id=row["pk"], **{field: row[f"_{field}"] for field in fields}
+            )
+            for row in rows.values("pk", *[f"_{field}" for field in fields])
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0008_alter_institution_typ_alter_versioninstitution_typ"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonSearchIndex",
+            fields=[
+                (
+                    "person",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="apis_ontology.person",
+                    ),
+                ),
+                (
+                    "memberships",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=4),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "acad_func",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "institute",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "geburtsorte",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "sterbeorte",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "ausbildunginst",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "akademiepreise",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "wiss_austausch",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("min_date_memb", models.DateField(blank=True, null=True)),
+                ("max_date_memb", models.DateField(blank=True, null=True)),
+                ("nsdap", models.BooleanField(default=False)),
+                ("nobelpreis", models.BooleanField(default=False)),
+            ],
+            options={
+                "verbose_name": "Suchindex Person",
+                "verbose_name_plural": "Suchindex Personen",
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.11 on 2026-10-16 23:49
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0009_personsearchindex"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["memberships"], name="psi_memberships_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["acad_func"], name="psi_acad_func_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["institute"], name="psi_institute_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["geburtsorte"], name="psi_geburtsorte_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["sterbeorte"], name="psi_sterbeorte_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["ausbildunginst"], name="psi_ausbildunginst_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["akademiepreise"], name="psi_akademiepreise_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personsearchindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["wiss_austausch"], name="psi_wiss_austausch_gin"
+            ),
+        ),
+    ]
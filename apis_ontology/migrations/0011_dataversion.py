@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-16 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0010_personsearchindex_gin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Datenversion",
+                "verbose_name_plural": "Datenversionen",
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:03
+
+import apis_ontology.models
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+IMMUTABLE_UNACCENT = """
+CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS
+$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_metainfo", "0017_delete_uri"),
+        ("apis_ontology", "0011_dataversion"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(
+            IMMUTABLE_UNACCENT, "DROP FUNCTION IF EXISTS immutable_unaccent(text);"
+        ),
+        migrations.AddIndex(
+            model_name="institution",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(
+                        apis_ontology.models.ImmutableUnaccent("label")
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="institution_label_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(
+                        apis_ontology.models.ImmutableUnaccent(
+                            django.db.models.functions.text.Concat(
+                                "forename", models.Value(" "), "surname"
+                            )
+                        )
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="person_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:07
+
+import apis_ontology.models
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# frozen copies of the constants of `apis_ontology.name_variants`
+NAME_FIELDS = {
+    "person": ["forename", "surname"],
+    "institution": ["label"],
+    "ort": ["label"],
+    "preis": ["name"],
+    "religion": ["name"],
+}
+VARIANT_FIELDS = {
+    "alternative_namen": "name",
+    "titel": "titel",
+}
+
+
+def collect_names(row, name_fields):
+    names = [" ".join(filter(None, (row[field] for field in name_fields)))]
+    for field, key in VARIANT_FIELDS.items():
+        for item in row.get(field) or []:
+            names.append(item.get(key) if isinstance(item, dict) else item)
+    names = (name.strip() for name in names if isinstance(name, str))
+    return "\n".join(dict.fromkeys(name for name in names if name))
+
+
+def populate(apps, schema_editor):
+    """the `NameVariants` of every entity, like `rebuild_name_variants`"""
+    NameVariants = apps.get_model("apis_ontology", "NameVariants")
+    for model_name, name_fields in NAME_FIELDS.items():
+        model = apps.get_model("apis_ontology", model_name)
+        variant_fields = [
+            field.name
+            for field in model._meta.get_fields()
+            if field.name in VARIANT_FIELDS
+        ]
+        rows = model.objects.order_by().values("pk", *name_fields, *variant_fields)
+        NameVariants.objects.bulk_create(
+            [
+                NameVariants(entity_id=row["pk"], names=collect_names(row, name_fields))
+                for row in rows.iterator(chunk_size=2000)
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_metainfo", "0017_delete_uri"),
+        ("apis_ontology", "0012_name_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NameVariants",
+            fields=[
+                (
+                    "entity",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="name_variants",
+                        serialize=False,
+                        to="apis_metainfo.rootobject",
+                    ),
+                ),
+                ("names", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Namensvarianten",
+                "verbose_name_plural": "Namensvarianten",
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="institution",
+            name="institution_label_trgm",
+        ),
+        migrations.RemoveIndex(
+            model_name="person",
+            name="person_name_trgm",
+        ),
+        migrations.AddIndex(
+            model_name="namevariants",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(
+                        apis_ontology.models.ImmutableUnaccent("names")
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="namevariants_names_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:22
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0013_namevariants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonDossier",
+            fields=[
+                (
+                    "person",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="dossier",
+                        serialize=False,
+                        to="apis_ontology.person",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("stale", models.BooleanField(default=False)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Dossier",
+                "verbose_name_plural": "Dossiers",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("stale", True)),
+                        fields=["person"],
+                        name="persondossier_stale",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:30
+
+import apis_ontology.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# frozen copy of `CLOSURE_SQL` for all institutions, with the structure
+# relations of `HIERARCHY_RELATIONS` and whether their object is the parent
+CLOSURE_SQL = """
+WITH RECURSIVE kinds(relation, object_up) AS (
+    VALUES
+        ('ist Teil von', true),
+        ('eingegliedert in', true),
+        ('hat Untereinheit', false),
+        ('gliedert ein', false)
+), edge AS (
+    SELECT
+        CASE WHEN k.object_up THEN r.subj_object_id ELSE r.obj_object_id END AS low,
+        CASE WHEN k.object_up THEN r.obj_object_id ELSE r.subj_object_id END AS high,
+        h.beginn_date_from AS valid_from, h.ende_date_to AS valid_to
+    FROM {hierarchy} h
+    JOIN {relation} r ON r.id = h.relation_ptr_id
+    JOIN kinds k ON k.relation = h.relation
+    WHERE r.subj_object_id <> r.obj_object_id
+), up AS (
+    SELECT low AS descendant, high AS ancestor, 1 AS depth, valid_from, valid_to,
+        ARRAY[low, high] AS path
+    FROM edge
+    UNION ALL
+    SELECT up.descendant, e.high, up.depth + 1,
+        GREATEST(up.valid_from, e.valid_from), LEAST(up.valid_to, e.valid_to),
+        up.path || e.high
+    FROM up JOIN edge e ON e.low = up.ancestor
+    WHERE NOT e.high = ANY(up.path)
+)
+INSERT INTO {closure} (descendant_id, ancestor_id, depth, valid_from, valid_to)
+SELECT DISTINCT ON (descendant, ancestor) descendant, ancestor, depth,
+    valid_from, valid_to
+FROM up
+WHERE EXISTS (SELECT FROM {institution} i WHERE i.rootobject_ptr_id = ancestor)
+AND EXISTS (SELECT FROM {institution} i WHERE i.rootobject_ptr_id = descendant)
+ORDER BY descendant, ancestor, depth, valid_from NULLS FIRST
+"""
+
+
+def populate(apps, schema_editor):
+    def table(app_label, model_name):
+        return apps.get_model(app_label, model_name)._meta.db_table
+
+    schema_editor.execute(
+        CLOSURE_SQL.format(
+            closure=table("apis_ontology", "InstitutionClosure"),
+            institution=table("apis_ontology", "Institution"),
+            hierarchy=table("apis_ontology", "InstitutionHierarchie"),
+            relation=table("relations", "Relation"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0014_persondossier"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstitutionClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveSmallIntegerField()),
+                ("valid_from", models.DateField(blank=True, null=True)),
+                ("valid_to", models.DateField(blank=True, null=True)),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="closure_descendants",
+                        to="apis_ontology.institution",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="closure_ancestors",
+                        to="apis_ontology.institution",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Übergeordnete Institution",
+                "verbose_name_plural": "Übergeordnete Institutionen",
+                "indexes": [
+                    models.Index(
+                        fields=["ancestor", "depth"], name="institutionclosure_ancestor"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("descendant", "ancestor"),
+                        name="institutionclosure_unique",
+                    )
+                ],
+            },
+            managers=[
+                ("objects", apis_ontology.models.InstitutionClosureManager()),
+            ],
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:32
+
+import apis_ontology.models
+from django.db import migrations, models
+
+
+def populate(apps, schema_editor):
+    """prizes awarded by an institution of the academy"""
+    academy = apps.get_model("apis_ontology", "Institution").objects.filter(
+        akademie_institution=True
+    )
+    apps.get_model("apis_ontology", "Preis").objects.update(
+        academy_prize=models.Exists(
+            apps.get_model("apis_ontology", "WirdVergebenVon").objects.filter(
+                subj_object_id=models.OuterRef("pk"),
+                obj_object_id__in=academy.values("pk"),
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_metainfo", "0017_delete_uri"),
+        ("apis_ontology", "0015_institutionclosure"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="preis",
+            managers=[
+                ("objects", apis_ontology.models.PreisManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="preis",
+            name="academy_prize",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Wird von einer Institution der Akademie vergeben",
+                verbose_name="Akademiepreis",
+            ),
+        ),
+        migrations.AddField(
+            model_name="versionpreis",
+            name="academy_prize",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Wird von einer Institution der Akademie vergeben",
+                verbose_name="Akademiepreis",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="preis",
+            index=models.Index(
+                condition=models.Q(("academy_prize", True)),
+                fields=["academy_prize"],
+                name="preis_academy_prize",
+            ),
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0016_preis_academy_prize"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bild",
+            name="thumb_url",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Signierte URL des Vorschaubilds, siehe rebuild_image_urls",
+                max_length=1024,
+                verbose_name="Vorschaubild-URL",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0017_bild_thumb_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bild",
+            name="thumb_srcset",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="srcset der Breiten THUMB_WIDTHS, siehe rebuild_image_urls",
+                verbose_name="Vorschaubild-Varianten",
+            ),
+        ),
+    ]
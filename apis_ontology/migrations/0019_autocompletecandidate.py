@@ -0,0 +1,81 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# frozen copy of `apis_ontology.candidates.CANDIDATE_RELATIONS`
+CANDIDATE_RELATIONS = {
+    "geburtsort": ("geborenin", {}),
+    "sterbeort": ("gestorbenin", {}),
+    "ausbildung": (
+        "ausbildungan",
+        {"typ__in": ["Studium", "Promotion", "Habilitation"]},
+    ),
+    "institution_beruf": ("positionan", {}),
+    "wissenschaftsaustausch": ("wissenschaftsaustauschin", {}),
+}
+
+
+def populate(apps, schema_editor):
+    """the objects of the relations of the members, per autocomplete"""
+    AutocompleteCandidate = apps.get_model("apis_ontology", "AutocompleteCandidate")
+    members = apps.get_model("apis_ontology", "Person").objects.filter(mitglied=True)
+    for kind, (model_name, filters) in CANDIDATE_RELATIONS.items():
+        ids = (
+            apps.get_model("apis_ontology", model_name)
+            .objects.filter(
+                subj_object_id__in=members.values("pk"),
+                obj_object_id__isnull=False,
+                **filters,
+            )
+            .order_by()
+            .values_list("obj_object_id", flat=True)
+            .distinct()
+        )
+        AutocompleteCandidate.objects.bulk_create(
+            [AutocompleteCandidate(kind=kind, entity_id=pk) for pk in ids],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_metainfo", "0017_delete_uri"),
+        ("apis_ontology", "0018_bild_thumb_srcset"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AutocompleteCandidate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=50)),
+                (
+                    "entity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="autocomplete_candidates",
+                        to="apis_metainfo.rootobject",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Autocomplete-Kandidat",
+                "verbose_name_plural": "Autocomplete-Kandidaten",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "entity"), name="autocompletecandidate_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
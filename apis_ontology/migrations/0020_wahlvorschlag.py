@@ -0,0 +1,133 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:42
+
+import apis_ontology.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# frozen copy of `apis_ontology.models.PROPOSAL_RELATIONS`
+PROPOSAL_RELATIONS = {
+    "oeawmitgliedschaft": (True, "beginn_date_sort"),
+    "nichtgewaehlt": (False, "datum_date_sort"),
+}
+
+
+def populate(apps, schema_editor):
+    """a row per proposer of the elections of the persons"""
+    Wahlvorschlag = apps.get_model("apis_ontology", "Wahlvorschlag")
+    persons = apps.get_model("apis_ontology", "Person").objects.values("pk")
+    for model_name, (success, date) in PROPOSAL_RELATIONS.items():
+        model = apps.get_model("apis_ontology", model_name)
+        links = model.vorgeschlagen_von.through.objects.filter(
+            **{f"{model_name}__subj_object_id__in": persons}
+        ).values_list(
+            model_name,
+            "person",
+            f"{model_name}__subj_object_id",
+            f"{model_name}__mitgliedschaft",
+            f"{model_name}__{date}",
+        )
+        Wahlvorschlag.objects.bulk_create(
+            [
+                Wahlvorschlag(
+                    relation_id=relation,
+                    proposer_id=proposer,
+                    candidate_id=candidate,
+                    success=success,
+                    mitgliedschaft=mitgliedschaft,
+                    date=date_sort,
+                )
+                for relation, proposer, candidate, mitgliedschaft, date_sort in links
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apis_ontology", "0019_autocompletecandidate"),
+        ("relations", "0003_relation_relations_r_subj_content_type_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Wahlvorschlag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("success", models.BooleanField(verbose_name="Wahl erfolgreich")),
+                (
+                    "mitgliedschaft",
+                    models.CharField(
+                        choices=[
+                            ("wM", "wM"),
+                            ("oM", "oM"),
+                            ("kM I", "kM I"),
+                            ("kM A", "kM A"),
+                            ("EM", "EM"),
+                            ("JA", "JA"),
+                        ],
+                        max_length=4,
+                        verbose_name="Art der Mitgliedschaft",
+                    ),
+                ),
+                ("date", models.DateField(blank=True, null=True, verbose_name="Datum")),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="proposals_received",
+                        to="apis_ontology.person",
+                        verbose_name="Vorgeschlagene(r)",
+                    ),
+                ),
+                (
+                    "proposer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="proposals_made",
+                        to="apis_ontology.person",
+                        verbose_name="Vorschlagende(r)",
+                    ),
+                ),
+                (
+                    "relation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="wahlvorschlaege",
+                        to="relations.relation",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Wahlvorschlag",
+                "verbose_name_plural": "Wahlvorschläge",
+                "indexes": [
+                    models.Index(
+                        fields=["proposer", "success", "candidate"],
+                        name="wahlvorschlag_proposer",
+                    ),
+                    models.Index(
+                        fields=["candidate", "success", "proposer"],
+                        name="wahlvorschlag_candidate",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("relation", "proposer"), name="wahlvorschlag_unique"
+                    )
+                ],
+            },
+            managers=[
+                ("objects", apis_ontology.models.WahlvorschlagManager()),
+            ],
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -4,21 +4,68 @@ from functools import cache
 
 from apis_core.apis_entities.abc import E21_Person, E53_Place, E74_Group
 from apis_core.apis_entities.models import AbstractEntity
+from apis_core.apis_metainfo.models import RootObject
 from apis_core.generic.abc import GenericModel
 from apis_core.history.models import VersionMixin
 from apis_core.relations.models import Relation
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
-from django.core.exceptions import ValidationError
-from django.db import models
-from django.utils.functional import cached_property
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from django_json_editor_field.fields import JSONEditorField
 
 from django_interval.fields import FuzzyDateParserField
+from apis_ontology.oefos import oefos
 from mine_frontend.settings import POSITIONEN
-from mine_frontend.utils import MyImgProxy
+from mine_frontend.utils import signed_url
+
+
+class ImmutableUnaccent(models.Func):
+    """``unaccent()`` declared ``IMMUTABLE``, so it can be used in indexes"""
+
+    function = "immutable_unaccent"
+    output_field = models.TextField()
+
+
+def search_text(expression):
+    """*expression* lower-cased and without accents
+
+    The trigram index of `NameVariants` is built on this expression; a
+    ``LIKE`` / ``similarity`` filter has to use it verbatim for Postgres to
+    pick it.
+    """
+    return Lower(ImmutableUnaccent(expression))
+
+
+def replace_rows(existing, rows, unique_fields, update_fields):
+    """ersetzt die Zeilen `existing` einer abgeleiteten Tabelle durch `rows`
+
+    Nur Zeilen, deren `unique_fields` in `rows` fehlen, werden gelöscht,
+    die übrigen eingefügt oder aktualisiert. Das Löschen läuft über das
+    ORM und damit über die ``post_delete``-Receiver von apis, die für jede
+    gelöschte Zeile die Datenbank abfragen.
+    """
+    model = existing.model
+    attnames = [model._meta.get_field(name).attname for name in unique_fields]
+    keep = {tuple(getattr(row, attname) for attname in attnames) for row in rows}
+    stale = [
+        pk
+        for pk, *key in existing.values_list("pk", *attnames)
+        if tuple(key) not in keep
+    ]
+    with transaction.atomic(using=existing.db):
+        existing.filter(pk__in=stale).delete()
+        model._default_manager.db_manager(existing.db).bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
 
 
 class NameMixin(models.Model):
@@ -124,35 +171,9 @@ class LegacyFieldsMixin(models.Model):
         abstract = True
 
 
-def add_to_dict(path, data, row):
-    for i, p in enumerate(path):
-        if i + 1 == len(path):
-            data[p] = {f"{row[2]}:{row[3]}": row[3]}
-            return data
-    raise ValidationError("Parsing of the OESTAT data for generating choices failed.")
-
-
 def get_oestat_choices():
-    res = dict()
-    with open(
-        f"{os.path.dirname(__file__)}/../resources/OEFOS2012_DE_CTI.txt",
-        newline="",
-        encoding="latin1",
-    ) as inp:
-        oestat = csv.reader(inp, delimiter=";", quotechar='"')
-        next(oestat)
-        current_path = []
-        old_level = 0
-        for row in oestat:
-            level = int(row[0])
-            text = row[3]
-            if level > old_level:
-                current_path.append(text)
-            elif level < old_level:
-                rm_levels = level - old_level
-                current_path = current_path[:rm_levels]
-            res = add_to_dict(current_path, res, row)
-    return res
+    """the choices of `Fach.oestat`, from the compiled OEFOS classification"""
+    return oefos().choices
 
 
 class Beruf(GenericModel, models.Model):
@@ -169,22 +190,57 @@ class Beruf(GenericModel, models.Model):
 
 class Bild(GenericModel, models.Model):
     BILD_KIND_CHOICES = (("OEAW Archiv", "OEAW Archiv"), ("Wikimedia", "Wikimedia"))
+    # Breiten der Varianten im srcset, für die Anzeige mit 110px in 1x bis 3x
+    THUMB_WIDTHS = (110, 220, 330)
     art = models.CharField(max_length=100, choices=BILD_KIND_CHOICES)
     pfad = models.CharField(max_length=1024)
     credit = models.TextField(max_length=1024, blank=True)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveBigIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
+    thumb_url = models.CharField(
+        max_length=1024,
+        blank=True,
+        editable=False,
+        verbose_name=_("Vorschaubild-URL"),
+        help_text=_("Signierte URL des Vorschaubilds, siehe rebuild_image_urls"),
+    )
+    thumb_srcset = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name=_("Vorschaubild-Varianten"),
+        help_text=_("srcset der Breiten THUMB_WIDTHS, siehe rebuild_image_urls"),
+    )
+
+    @property
+    def proxy_path(self):
+        return f"26962/portraits/{self.pfad}"
 
     @property
     def thumb_img(self):
-        myimgproxy = MyImgProxy()
-        return myimgproxy.resize(f"26962/portraits/{self.pfad}")
+        return self.thumb_url or self.signed_thumb_url()
 
     @property
     def img_url(self):
-        myimgproxy = MyImgProxy()
-        return myimgproxy.img_url(f"26962/portraits/{self.pfad}")
+        return signed_url(self.proxy_path)
+
+    @property
+    def srcset(self):
+        return self.thumb_srcset or self.signed_srcset()
+
+    def signed_thumb_url(self):
+        return signed_url(self.proxy_path, "resize", 150, 200)
+
+    def signed_srcset(self):
+        return ", ".join(
+            f"{signed_url(self.proxy_path, 'resize', width, width * 4 // 3)} {width}w"
+            for width in self.THUMB_WIDTHS
+        )
+
+    def save(self, *args, **kwargs):
+        self.thumb_url = self.signed_thumb_url()
+        self.thumb_srcset = self.signed_srcset()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return str(self.art) + ": " + str(self.pfad)
@@ -243,21 +299,31 @@ class Ereignis(
 
 
 class PreisManager(models.Manager):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                academy_prize=models.Exists(
-                    WirdVergebenVon.objects.filter(
-                        subj_object_id=models.OuterRef("pk"),
-                        obj_object_id__in=Institution.objects.filter(
-                            akademie_institution=True
-                        ).values_list("id", flat=True),
-                    )
-                )
+    use_in_migrations = True
+
+    def refresh_academy_prize(self, pks=()):
+        """speichert `academy_prize` der Preise `pks` und aller bisher markierten
+
+        Mit `pks=None` werden alle Preise geprüft. Gibt die Primärschlüssel
+        der geänderten Preise zurück.
+        """
+        apps = self.model._meta.apps
+        awarded = models.Exists(
+            apps.get_model("apis_ontology", "WirdVergebenVon").objects.filter(
+                subj_object_id=models.OuterRef("pk"),
+                obj_object_id__in=apps.get_model("apis_ontology", "Institution")
+                .objects.filter(akademie_institution=True)
+                .values("pk"),
             )
         )
+        prizes = self.all()
+        if pks is not None:
+            prizes = prizes.filter(models.Q(pk__in=pks) | models.Q(academy_prize=True))
+        changed = list(
+            prizes.exclude(academy_prize=awarded).values_list("pk", flat=True)
+        )
+        self.filter(pk__in=changed).update(academy_prize=awarded)
+        return changed
 
 
 class Preis(
@@ -271,25 +337,29 @@ class Preis(
 
     objects = PreisManager()
 
-    @cached_property
-    def academy_prize(self):
-        return WirdVergebenVon.objects.filter(
-            subj_object_id=self.pk,
-            obj_object_id__in=Institution.objects.filter(
-                akademie_institution=True
-            ).values_list("id", flat=True),
-        ).exists()
-
     text = models.TextField(blank=True)
     datum_ausschreibung = FuzzyDateParserField(
         blank=True, help_text="Datum der Ausschreibung bei Preisaufgaben"
     )
     beginn = FuzzyDateParserField(blank=True, help_text="Gründungsdatum des Preises")
     ende = FuzzyDateParserField(blank=True, help_text="Auflösungsdatum des Preises")
+    academy_prize = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Akademiepreis",
+        help_text="Wird von einer Institution der Akademie vergeben",
+    )
 
     class Meta(VersionMixin.Meta, AbstractEntity.Meta, NameMixin.Meta):
         verbose_name = "Preis/Preisausschreiben"
         verbose_name_plural = "Preise/Preisausschreiben"
+        indexes = [
+            models.Index(
+                fields=["academy_prize"],
+                name="preis_academy_prize",
+                condition=models.Q(academy_prize=True),
+            )
+        ]
 
     def __str__(self):
         return self.name
@@ -724,6 +794,34 @@ def get_choices_inst_hierarchie():
     return res
 
 
+STRUCTURE = "structure"
+LINEAGE = "lineage"
+
+# Hierarchie-Relationen nach Art (Gliederung oder Abfolge) und ob das Objekt
+# die übergeordnete bzw. vorangehende Institution des Subjekts ist
+HIERARCHY_RELATIONS = {
+    "ist Teil von": (STRUCTURE, True),
+    "eingegliedert in": (STRUCTURE, True),
+    "hat Untereinheit": (STRUCTURE, False),
+    "gliedert ein": (STRUCTURE, False),
+    "umbenannt von": (LINEAGE, True),
+    "umgewandelt von": (LINEAGE, True),
+    "zusammengelegt mit": (LINEAGE, True),
+    "ist Nachfolger von": (LINEAGE, True),
+    "umbenannt in": (LINEAGE, False),
+    "umgewandelt in": (LINEAGE, False),
+    "ist Vorgänger von": (LINEAGE, False),
+}
+
+
+def structure_child(relation, subj_id, obj_id):
+    """die untergeordnete Institution einer Gliederungs-Relation, sonst None"""
+    kind, object_up = HIERARCHY_RELATIONS.get(relation, (None, None))
+    if kind != STRUCTURE:
+        return None
+    return subj_id if object_up else obj_id
+
+
 class InstitutionHierarchie(Relation, VersionMixin, LegacyFieldsMixin):
     subj_model = Institution
     obj_model = Institution
@@ -751,6 +849,9 @@ class InstitutionHierarchie(Relation, VersionMixin, LegacyFieldsMixin):
                 self.relation_reverse = d["name_reverse"]
         super().save(*args, **kwargs)
 
+    def structure_child(self):
+        return structure_child(self.relation, self.subj_object_id, self.obj_object_id)
+
 
 class WirdVergebenVon(Relation, VersionMixin, LegacyFieldsMixin):
     subj_model = Preis
@@ -1256,3 +1357,394 @@ class HaeltRedeBei(Relation, VersionMixin, LegacyFieldsMixin):
     class Meta(LegacyFieldsMixin.Meta):
         verbose_name = _("Hält Rede bei")
         verbose_name_plural = _("Redner")
+
+
+class PersonSearchIndex(models.Model):
+    """denormalisierte Suchfelder eines Mitglieds für die Mitgliedersuche
+
+    Die Zeilen werden aus den Relationen der Person berechnet, siehe
+    `apis_ontology.search_index`.
+    """
+
+    person = models.OneToOneField(
+        Person,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_index",
+    )
+    memberships = ArrayField(models.CharField(max_length=4), default=list)
+    acad_func = ArrayField(models.CharField(max_length=255), default=list)
+    institute = ArrayField(models.PositiveIntegerField(), default=list)
+    geburtsorte = ArrayField(models.PositiveIntegerField(), default=list)
+    sterbeorte = ArrayField(models.PositiveIntegerField(), default=list)
+    ausbildunginst = ArrayField(models.PositiveIntegerField(), default=list)
+    akademiepreise = ArrayField(models.PositiveIntegerField(), default=list)
+    wiss_austausch = ArrayField(models.PositiveIntegerField(), default=list)
+    min_date_memb = models.DateField(blank=True, null=True)
+    max_date_memb = models.DateField(blank=True, null=True)
+    nsdap = models.BooleanField(default=False)
+    nobelpreis = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = _("Suchindex Person")
+        verbose_name_plural = _("Suchindex Personen")
+        indexes = [
+            GinIndex(fields=[field], name=f"psi_{field}_gin")
+            for field in [
+                "memberships",
+                "acad_func",
+                "institute",
+                "geburtsorte",
+                "sterbeorte",
+                "ausbildunginst",
+                "akademiepreise",
+                "wiss_austausch",
+            ]
+        ]
+
+
+class NameVariants(models.Model):
+    """alle Namen einer Entität für die Namenssuche, einer pro Zeile
+
+    Name, alternative Namen und Titel werden beim Speichern der Entität
+    übernommen, siehe `apis_ontology.name_variants`.
+    """
+
+    entity = models.OneToOneField(
+        RootObject,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="name_variants",
+    )
+    names = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("Namensvarianten")
+        verbose_name_plural = _("Namensvarianten")
+        indexes = [
+            GinIndex(
+                OpClass(search_text("names"), name="gin_trgm_ops"),
+                name="namevariants_names_trgm",
+            ),
+        ]
+
+
+# die Relationen mit Wahlvorschlägen: ob die Wahl erfolgreich war und das
+# Feld mit dem Datum, zu dem die Vorschläge in `Wahlvorschlag` gespeichert werden
+PROPOSAL_RELATIONS = {
+    "oeawmitgliedschaft": (True, "beginn_date_sort"),
+    "nichtgewaehlt": (False, "datum_date_sort"),
+}
+
+
+class WahlvorschlagManager(models.Manager):
+    use_in_migrations = True
+
+    def refresh(self, relation_ids=None):
+        """speichert die Wahlvorschläge der Relationen `relation_ids`, ohne alle"""
+        apps = self.model._meta.apps
+        persons = apps.get_model("apis_ontology", "Person").objects.values("pk")
+        proposals = []
+        for model_name, (success, date) in PROPOSAL_RELATIONS.items():
+            model = apps.get_model("apis_ontology", model_name)
+            links = model.vorgeschlagen_von.through.objects.filter(
+                **{f"{model_name}__subj_object_id__in": persons}
+            )
+            if relation_ids is not None:
+                links = links.filter(**{f"{model_name}__in": relation_ids})
+            proposals += [
+                self.model(
+                    relation_id=relation,
+                    proposer_id=proposer,
+                    candidate_id=candidate,
+                    success=success,
+                    mitgliedschaft=mitgliedschaft,
+                    date=date_sort,
+                )
+                for relation, proposer, candidate, mitgliedschaft, date_sort in (
+                    links.values_list(
+                        model_name,
+                        "person",
+                        f"{model_name}__subj_object_id",
+                        f"{model_name}__mitgliedschaft",
+                        f"{model_name}__{date}",
+                    )
+                )
+            ]
+        rows = self.all()
+        if relation_ids is not None:
+            rows = rows.filter(relation_id__in=relation_ids)
+        replace_rows(
+            rows,
+            proposals,
+            unique_fields=["relation", "proposer"],
+            update_fields=["candidate", "success", "mitgliedschaft", "date"],
+        )
+
+
+class Wahlvorschlag(models.Model):
+    """wer wen zur Wahl vorgeschlagen hat, je Vorschlag einer Relation
+
+    Abgeleitet aus `vorgeschlagen_von` von `OeawMitgliedschaft` (erfolgreich)
+    und `NichtGewaehlt` (nicht erfolgreich).
+    """
+
+    relation = models.ForeignKey(
+        Relation, on_delete=models.CASCADE, related_name="wahlvorschlaege"
+    )
+    proposer = models.ForeignKey(
+        Person,
+        on_delete=models.CASCADE,
+        related_name="proposals_made",
+        verbose_name=_("Vorschlagende(r)"),
+    )
+    candidate = models.ForeignKey(
+        Person,
+        on_delete=models.CASCADE,
+        related_name="proposals_received",
+        verbose_name=_("Vorgeschlagene(r)"),
+    )
+    success = models.BooleanField(verbose_name=_("Wahl erfolgreich"))
+    mitgliedschaft = models.CharField(
+        max_length=4,
+        choices=OeawMitgliedschaft.MEMBERSHIP_CHOICES,
+        verbose_name=_("Art der Mitgliedschaft"),
+    )
+    date = models.DateField(blank=True, null=True, verbose_name=_("Datum"))
+
+    objects = WahlvorschlagManager()
+
+    class Meta:
+        verbose_name = _("Wahlvorschlag")
+        verbose_name_plural = _("Wahlvorschläge")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["relation", "proposer"], name="wahlvorschlag_unique"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["proposer", "success", "candidate"],
+                name="wahlvorschlag_proposer",
+            ),
+            models.Index(
+                fields=["candidate", "success", "proposer"],
+                name="wahlvorschlag_candidate",
+            ),
+        ]
+
+
+class AutocompleteCandidate(models.Model):
+    """die Entitäten, die ein Autocomplete der Suche anbietet
+
+    Eine Zeile je Autocomplete (`kind`) und Entität, die über die Relation
+    des Autocompletes mit einem Mitglied verbunden ist, siehe
+    `apis_ontology.candidates`. Die Namen kommen aus `NameVariants`.
+    """
+
+    kind = models.CharField(max_length=50)
+    entity = models.ForeignKey(
+        RootObject,
+        on_delete=models.CASCADE,
+        related_name="autocomplete_candidates",
+    )
+
+    class Meta:
+        verbose_name = _("Autocomplete-Kandidat")
+        verbose_name_plural = _("Autocomplete-Kandidaten")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "entity"], name="autocompletecandidate_unique"
+            )
+        ]
+
+
+class PersonDossier(models.Model):
+    """alle Daten der Detailseite eines Mitglieds als ein JSON-Dokument
+
+    Das Dokument wird aus den Relationen der Person berechnet, siehe
+    `mine_frontend.dossier`, und bei Änderungen als veraltet markiert.
+    """
+
+    person = models.OneToOneField(
+        Person,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="dossier",
+    )
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    stale = models.BooleanField(default=False)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Dossier")
+        verbose_name_plural = _("Dossiers")
+        indexes = [
+            models.Index(
+                fields=["person"],
+                condition=models.Q(stale=True),
+                name="persondossier_stale",
+            )
+        ]
+
+
+# Ebenen, über die die Gliederung höchstens verfolgt wird, weit mehr als es gibt
+CLOSURE_MAX_DEPTH = 30
+
+# Gliederung aller Institutionen, aufsteigend von jeder Institution aus, über
+# gleiche Kanten nur einmal; ein Weg endet, wenn er eine Institution zum
+# zweiten Mal erreichen würde oder `CLOSURE_MAX_DEPTH` Ebenen lang ist
+CLOSURE_SQL = """
+WITH RECURSIVE kinds(relation, object_up) AS (
+    SELECT * FROM unnest(%(relations)s::text[], %(ups)s::bool[])
+), edge AS (
+    SELECT DISTINCT
+        CASE WHEN k.object_up THEN r.subj_object_id ELSE r.obj_object_id END AS low,
+        CASE WHEN k.object_up THEN r.obj_object_id ELSE r.subj_object_id END AS high,
+        h.beginn_date_from AS valid_from, h.ende_date_to AS valid_to
+    FROM {hierarchy} h
+    JOIN {relation} r ON r.id = h.relation_ptr_id
+    JOIN kinds k ON k.relation = h.relation
+    WHERE r.subj_object_id <> r.obj_object_id
+), up AS (
+    SELECT low AS descendant, high AS ancestor, 1 AS depth, valid_from, valid_to,
+        ARRAY[low, high] AS path
+    FROM edge
+    WHERE %(all)s OR low = ANY(%(descendants)s)
+    UNION ALL
+    SELECT up.descendant, e.high, up.depth + 1,
+        GREATEST(up.valid_from, e.valid_from), LEAST(up.valid_to, e.valid_to),
+        up.path || e.high
+    FROM up JOIN edge e ON e.low = up.ancestor
+    WHERE NOT e.high = ANY(up.path) AND up.depth < %(max_depth)s
+)
+SELECT DISTINCT ON (descendant, ancestor) descendant, ancestor, depth,
+    valid_from, valid_to
+FROM up
+WHERE EXISTS (SELECT FROM {institution} i WHERE i.rootobject_ptr_id = ancestor)
+AND EXISTS (SELECT FROM {institution} i WHERE i.rootobject_ptr_id = descendant)
+ORDER BY descendant, ancestor, depth, valid_from NULLS FIRST
+"""
+
+
+class InstitutionClosureManager(models.Manager):
+    use_in_migrations = True
+
+    def refresh(self, descendants=None):
+        """berechnet die Zeilen der Institutionen `descendants` neu, ohne alle"""
+        apps = self.model._meta.apps
+        sql = CLOSURE_SQL.format(
+            institution=apps.get_model("apis_ontology", "Institution")._meta.db_table,
+            hierarchy=apps.get_model(
+                "apis_ontology", "InstitutionHierarchie"
+            )._meta.db_table,
+            relation=apps.get_model("relations", "Relation")._meta.db_table,
+        )
+        structure = {
+            relation: up
+            for relation, (kind, up) in HIERARCHY_RELATIONS.items()
+            if kind == STRUCTURE
+        }
+        params = {
+            "relations": list(structure),
+            "ups": list(structure.values()),
+            "all": descendants is None,
+            "max_depth": CLOSURE_MAX_DEPTH,
+            "descendants": list(descendants or []),
+        }
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            closure = [
+                self.model(
+                    descendant_id=descendant,
+                    ancestor_id=ancestor,
+                    depth=depth,
+                    valid_from=valid_from,
+                    valid_to=valid_to,
+                )
+                for descendant, ancestor, depth, valid_from, valid_to in cursor
+            ]
+        rows = self.all()
+        if descendants is not None:
+            rows = rows.filter(descendant_id__in=params["descendants"])
+        replace_rows(
+            rows,
+            closure,
+            unique_fields=["descendant", "ancestor"],
+            update_fields=["depth", "valid_from", "valid_to"],
+        )
+
+    def refresh_below(self, institutions):
+        """berechnet die Zeilen von `institutions` und ihren Untereinheiten neu"""
+        institutions = set(institutions)
+        if not institutions:
+            return
+        below = self.filter(ancestor_id__in=institutions).values_list(
+            "descendant_id", flat=True
+        )
+        self.refresh(institutions | set(below))
+
+
+class InstitutionClosure(models.Model):
+    """übergeordnete Institutionen jeder Institution, über alle Ebenen
+
+    Abgeleitet aus den Gliederungs-Relationen von `InstitutionHierarchie`;
+    `depth` ist die Zahl der Ebenen auf dem kürzesten Weg, die Gültigkeit
+    die Schnittmenge der Zeiträume der Relationen auf diesem Weg.
+    """
+
+    ancestor = models.ForeignKey(
+        Institution, on_delete=models.CASCADE, related_name="closure_descendants"
+    )
+    descendant = models.ForeignKey(
+        Institution, on_delete=models.CASCADE, related_name="closure_ancestors"
+    )
+    depth = models.PositiveSmallIntegerField()
+    valid_from = models.DateField(blank=True, null=True)
+    valid_to = models.DateField(blank=True, null=True)
+
+    objects = InstitutionClosureManager()
+
+    class Meta:
+        verbose_name = _("Übergeordnete Institution")
+        verbose_name_plural = _("Übergeordnete Institutionen")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["descendant", "ancestor"], name="institutionclosure_unique"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["ancestor", "depth"], name="institutionclosure_ancestor"
+            )
+        ]
+
+
+class DataVersionManager(models.Manager):
+    def current(self, key):
+        return self.filter(key=key).values_list("version", flat=True).first() or 0
+
+    def bump(self, *keys):
+        self.bulk_create([self.model(key=key) for key in keys], ignore_conflicts=True)
+        self.filter(key__in=keys).update(version=models.F("version") + 1)
+
+
+class DataVersion(models.Model):
+    """Zähler, der bei jeder Änderung der unter `key` gecachten Daten erhöht wird"""
+
+    # erhöht bei jeder Änderung eines Objekts aus `apis_ontology`
+    ONTOLOGY = "apis_ontology"
+
+    @staticmethod
+    def entity(pk):
+        """Schlüssel der Version der Detailseite der Entität `pk`"""
+        return f"entity:{pk}"
+
+    key = models.CharField(max_length=255, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = DataVersionManager()
+
+    class Meta:
+        verbose_name = _("Datenversion")
+        verbose_name_plural = _("Datenversionen")
@@ -0,0 +1,70 @@
+from django.apps import apps as global_apps
+from django.db.models import F
+
+from apis_ontology.models import search_text
+
+# models with name variants and the fields making up their primary name
+NAME_FIELDS = {
+    "person": ["forename", "surname"],
+    "institution": ["label"],
+    "ort": ["label"],
+    "preis": ["name"],
+    "religion": ["name"],
+}
+
+# list fields holding further names, with the key of the name in JSON objects
+VARIANT_FIELDS = {
+    "alternative_namen": "name",
+    "titel": "titel",
+}
+
+
+def search_names():
+    """all names of an entity for a ``trigram`` filter, see `search_text`"""
+    return search_text(F("name_variants__names"))
+
+
+def collect_names(row, name_fields):
+    """the distinct names in *row*, a dict of field values, one per line"""
+    names = [" ".join(filter(None, (row[field] for field in name_fields)))]
+    for field, key in VARIANT_FIELDS.items():
+        for item in row.get(field) or []:
+            names.append(item.get(key) if isinstance(item, dict) else item)
+    names = (name.strip() for name in names if isinstance(name, str))
+    return "\n".join(dict.fromkeys(name for name in names if name))
+
+
+def refresh_name_variants(model, pks=None, apps=global_apps):
+    """store the `NameVariants` of the *model* instances with *pks*
+
+    Without *pks* all instances of *model* are updated. *apps* allows the
+    use in migrations. Returns the number of rows written.
+    """
+    NameVariants = apps.get_model("apis_ontology", "NameVariants")
+    name_fields = NAME_FIELDS[model._meta.model_name]
+    variant_fields = [
+        field.name for field in model._meta.get_fields() if field.name in VARIANT_FIELDS
+    ]
+    rows = model.objects.order_by().values("pk", *name_fields, *variant_fields)
+    if pks is not None:
+        rows = rows.filter(pk__in=pks)
+    variants = [
+        NameVariants(entity_id=row["pk"], names=collect_names(row, name_fields))
+        for row in rows.iterator(chunk_size=2000)
+    ]
+    NameVariants.objects.bulk_create(
+        variants,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["entity"],
+        update_fields=["names"],
+    )
+    return len(variants)
+
+
+def rebuild_name_variants(apps=global_apps):
+    """store the `NameVariants` of every entity of the `NAME_FIELDS` models"""
+    return sum(
+        refresh_name_variants(apps.get_model("apis_ontology", model_name), apps=apps)
+        for model_name in NAME_FIELDS
+    )
@@ -0,0 +1,134 @@
+import csv
+import hashlib
+import io
+import logging
+import os
+import pickle
+from bisect import bisect_left
+from functools import cache
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = f"{os.path.dirname(__file__)}/../resources"
+# the Österreichische Systematik der Wissenschaftszweige 2012 of Statistik Austria
+SOURCE = f"{RESOURCES}/OEFOS2012_DE_CTI.txt"
+# the classification compiled from SOURCE by `compile_oefos`, see `compile_tree`
+COMPILED = f"{RESOURCES}/OEFOS2012_DE_CTI.pickle"
+# bumped whenever the structure returned by `compile_tree` changes
+FORMAT_VERSION = 1
+
+
+class OefosEntry(NamedTuple):
+    code: str
+    title: str
+    short_title: str
+    level: int
+    parent: str | None
+
+
+def checksum(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def compile_tree(data):
+    """the classification in the CSV *data*, as a dict of builtin types
+
+    ``entries`` maps each code to the fields of its `OefosEntry`, in the
+    order of the CSV, and ``choices`` are the choices of `Fach.oestat`:
+    one group per title with the single choice ``code:title``, where a
+    later row with the same title replaces the earlier one.
+    """
+    reader = csv.reader(
+        io.StringIO(data.decode("latin1"), newline=""), delimiter=";", quotechar='"'
+    )
+    next(reader)
+    entries = {}
+    choices = {}
+    path = []
+    for level, _, code, title, short_title in reader:
+        level = int(level)
+        del path[level - 1 :]
+        entries[code] = (code, title, short_title, level, path[-1] if path else None)
+        choices[title] = {f"{code}:{title}": title}
+        path.append(code)
+    return {
+        "version": FORMAT_VERSION,
+        "checksum": checksum(data),
+        "entries": entries,
+        "choices": choices,
+    }
+
+
+def compile_oefos(source=SOURCE, target=COMPILED):
+    """compile the CSV *source* to the pickle *target*, returns the tree"""
+    with open(source, "rb") as inp:
+        tree = compile_tree(inp.read())
+    with open(target, "wb") as out:
+        pickle.dump(tree, out, protocol=pickle.HIGHEST_PROTOCOL)
+    return tree
+
+
+def load_tree(source=SOURCE, compiled=COMPILED):
+    """the compiled tree of *source*, compiled anew if *compiled* is outdated"""
+    with open(source, "rb") as inp:
+        data = inp.read()
+    try:
+        with open(compiled, "rb") as inp:
+            tree = pickle.load(inp)
+    except FileNotFoundError:
+        tree = None
+    if (
+        tree is not None
+        and tree["version"] == FORMAT_VERSION
+        and tree["checksum"] == checksum(data)
+    ):
+        return tree
+    logger.warning("%s is outdated, run the compile_oefos command", compiled)
+    return compile_tree(data)
+
+
+class Oefos:
+    """The OEFOS classification with lookups by code.
+
+    The codes of the sections (level 1) are one digit long and every code
+    starts with the code of its parent, so a subtree is a prefix lookup.
+    """
+
+    def __init__(self, tree):
+        self.entries = {
+            code: OefosEntry(*fields) for code, fields in tree["entries"].items()
+        }
+        self.choices = tree["choices"]
+        self.codes = sorted(self.entries)
+
+    def __getitem__(self, code):
+        return self.entries[code]
+
+    def __contains__(self, code):
+        return code in self.entries
+
+    def path(self, code):
+        """the entries from the section down to *code*"""
+        path = []
+        while code is not None:
+            entry = self.entries[code]
+            path.append(entry)
+            code = entry.parent
+        return path[::-1]
+
+    def with_prefix(self, prefix):
+        """the entries with a code starting with *prefix*, ordered by code"""
+        start = bisect_left(self.codes, prefix)
+        end = bisect_left(self.codes, prefix + "\U0010ffff", start)
+        return [self.entries[code] for code in self.codes[start:end]]
+
+    def entry_of_choice(self, value):
+        """the entry of a value of `Fach.oestat`, ``code:title``"""
+        return self.entries.get(value.partition(":")[0])
+
+
+@cache
+def oefos():
+    """the OEFOS classification, loaded once per process"""
+    return Oefos(load_tree())
@@ -0,0 +1,162 @@
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Subquery, Value, When
+
+from apis_ontology.models import (
+    AusbildungAn,
+    DataVersion,
+    GeborenIn,
+    GestorbenIn,
+    Gewinnt,
+    Institution,
+    Mitglied,
+    OeawMitgliedschaft,
+    Person,
+    PersonSearchIndex,
+    PositionAn,
+    Preis,
+    WissenschaftsaustauschIn,
+    replace_rows,
+)
+from mine_frontend.settings import POSITIONEN_PRES
+
+SEARCH_INDEX_VERSION = "person_search_index"
+
+NOBELPREISE = [
+    "Nobelpreis für Chemie",
+    "Nobelpreis für Physik",
+    "Nobelpreis für Physiologie oder Medizin",
+    "Alfred-Nobel-Gedächtnispreis für Wirtschaftswissenschaften",
+    "Nobelpreis für Literatur",
+    "Friedensnobelpreis",
+]
+
+INDEX_FIELDS = [
+    "memberships",
+    "acad_func",
+    "institute",
+    "geburtsorte",
+    "sterbeorte",
+    "ausbildunginst",
+    "akademiepreise",
+    "wiss_austausch",
+    "min_date_memb",
+    "max_date_memb",
+    "nsdap",
+    "nobelpreis",
+]
+
+
+def person_search_queryset():
+    """members annotated with the values stored in `PersonSearchIndex`
+
+    Every value is computed with a correlated subquery, so this is only
+    used to (re)build the index and as the baseline for benchmarks.
+    """
+    memb = (
+        OeawMitgliedschaft.objects.filter(subj_object_id=OuterRef("id"))
+        .values("mitgliedschaft")
+        .distinct()
+    )
+    memb_dates = OeawMitgliedschaft.objects.filter(subj_object_id=OuterRef("id"))
+    klasse_ids = Institution.objects.filter(
+        id=OuterRef("obj_object_id"), typ="Klasse"
+    ).values_list("id", flat=True)
+    insts_academy = Institution.objects.filter(
+        id=OuterRef("obj_object_id"), akademie_institution=True
+    ).values_list("id", flat=True)
+    func_presidium = (
+        PositionAn.objects.filter(
+            subj_object_id=OuterRef("id"),
+            position__in=POSITIONEN_PRES,
+        )
+        .annotate(academy_inst=Subquery(klasse_ids))
+        .filter(
+            academy_inst__isnull=False,
+        )
+        .values_list("position")
+        .distinct()
+    )
+    insts = (
+        PositionAn.objects.filter(subj_object_id=OuterRef("id"))
+        .annotate(academy_inst=Subquery(insts_academy))
+        .filter(academy_inst__isnull=False)
+        .values_list("obj_object_id", flat=True)
+        .distinct()
+    )
+    geburts_orte = GeborenIn.objects.filter(subj_object_id=OuterRef("id")).values_list(
+        "obj_object_id", flat=True
+    )
+    sterbe_orte = GestorbenIn.objects.filter(subj_object_id=OuterRef("id")).values_list(
+        "obj_object_id", flat=True
+    )
+    ausbildung_inst = AusbildungAn.objects.filter(
+        subj_object_id=OuterRef("id"),
+        typ__in=["Studium", "Promotion", "Habilitation"],
+    ).values_list("obj_object_id", flat=True)
+    nsdap_id = Institution.objects.filter(
+        label="Nationalsozialistische Deutsche Arbeiterpartei"
+    ).values_list("id", flat=True)
+    memb_nsdap = Mitglied.objects.filter(
+        subj_object_id=OuterRef("id"), obj_object_id=Subquery(nsdap_id[:1])
+    )
+    nobel_p = Preis.objects.filter(name__in=NOBELPREISE).values_list("id", flat=True)
+    nobelpreis = Gewinnt.objects.filter(
+        subj_object_id=OuterRef("pk"), obj_object_id__in=nobel_p
+    )
+    akademiepreise = Preis.objects.filter(academy_prize=True).values_list(
+        "id", flat=True
+    )
+    akadp_won = Gewinnt.objects.filter(
+        subj_object_id=OuterRef("pk"), obj_object_id__in=akademiepreise
+    ).values_list("obj_object_id", flat=True)
+    wiss_austausch = WissenschaftsaustauschIn.objects.filter(
+        subj_object_id=OuterRef("pk")
+    ).values_list("obj_object_id", flat=True)
+
+    return Person.objects.filter(mitglied=True).annotate(
+        memberships=ArraySubquery(memb),
+        acad_func=ArraySubquery(func_presidium),
+        institute=ArraySubquery(insts),
+        geburtsorte=ArraySubquery(geburts_orte),
+        sterbeorte=ArraySubquery(sterbe_orte),
+        ausbildunginst=ArraySubquery(ausbildung_inst),
+        min_date_memb=Subquery(
+            memb_dates.order_by("beginn_date_from").values("beginn_date_from")[:1]
+        ),
+        max_date_memb=Subquery(
+            memb_dates.order_by("-ende_date_to").values("ende_date_to")[:1]
+        ),
+        nsdap=Case(When(Exists(memb_nsdap), then=Value(True)), default=Value(False)),
+        nobelpreis=Case(
+            When(Exists(nobelpreis), then=Value(True)), default=Value(False)
+        ),
+        akademiepreise=ArraySubquery(akadp_won),
+        wiss_austausch=ArraySubquery(wiss_austausch),
+    )
+
+
+def refresh_person_search_index(person_ids=None):
+    """recompute the `PersonSearchIndex` rows of *person_ids*
+
+    Without *person_ids* the whole index is rebuilt. Persons that are not
+    (or no longer) members lose their row. Every refresh bumps the
+    `SEARCH_INDEX_VERSION` and `DataVersion.ONTOLOGY` data versions, the
+    latter for the cached result counts. Returns the number of rows written.
+    """
+    source = person_search_queryset().order_by()
+    existing = PersonSearchIndex.objects.all()
+    if person_ids is not None:
+        person_ids = list(person_ids)
+        source = source.filter(pk__in=person_ids)
+        existing = existing.filter(person_id__in=person_ids)
+    rows = [
+        PersonSearchIndex(person_id=row.pop("pk"), **row)
+        for row in source.values("pk", *INDEX_FIELDS)
+    ]
+    with transaction.atomic():
+        replace_rows(
+            existing, rows, unique_fields=["person"], update_fields=INDEX_FIELDS
+        )
+        DataVersion.objects.bump(SEARCH_INDEX_VERSION, DataVersion.ONTOLOGY)
+    return len(rows)
@@ -1,3 +1,5 @@
+import os
+
 from apis_acdhch_default_settings.settings import *  # noqa: F403
 
 INSTALLED_APPS += ["apis_core.documentation"]  # noqa: F405
@@ -13,6 +15,29 @@ ROOT_URLCONF = "apis_ontology.urls"
 
 LANGUAGE_CODE = "de"
 
+# values of environment variables that switch an option on
+TRUE_VALUES = {"1", "true", "yes"}
+
+# count the facets of the member search in memory, see mine_frontend.bitsets
+MINE_BITSET_FACETS = os.environ.get("MINE_BITSET_FACETS", "").lower() in TRUE_VALUES
+
+# search the autocompletes in memory, see mine_frontend.autocomplete_index
+MINE_AUTOCOMPLETE_INDEX = (
+    os.environ.get("MINE_AUTOCOMPLETE_INDEX", "").lower() in TRUE_VALUES
+)
+
+# the {% cache %} fragments of the detail pages, see mine_frontend.cache
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "template_fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "template_fragments",
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+}
+
 
 MIDDLEWARE += [  # noqa: F405
     "auditlog.middleware.AuditlogMiddleware",
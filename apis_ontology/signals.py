@@ -0,0 +1,533 @@
+from apis_core.apis_metainfo.models import RootObject
+from apis_core.relations.models import Relation
+from apis_core.uris.models import Uri
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from apis_ontology.candidates import CANDIDATE_RELATIONS, refresh_candidates
+from apis_ontology.models import (
+    AusbildungAn,
+    Beruf,
+    Bild,
+    DataVersion,
+    Fach,
+    GeborenIn,
+    GestorbenIn,
+    Gewinnt,
+    Institution,
+    InstitutionClosure,
+    InstitutionHierarchie,
+    Mitglied,
+    NichtGewaehlt,
+    OeawMitgliedschaft,
+    Ort,
+    Person,
+    PersonDossier,
+    PositionAn,
+    Preis,
+    Wahlvorschlag,
+    Werk,
+    WirdVergebenVon,
+    WissenschaftsaustauschIn,
+    structure_child,
+)
+from apis_ontology.name_variants import NAME_FIELDS, refresh_name_variants
+from apis_ontology.search_index import (
+    SEARCH_INDEX_VERSION,
+    refresh_person_search_index,
+)
+from mine_frontend.hierarchy import institution_lineage
+
+# relations with a person as subject whose objects end up in `PersonSearchIndex`
+SEARCH_INDEX_RELATIONS = [
+    OeawMitgliedschaft,
+    PositionAn,
+    GeborenIn,
+    GestorbenIn,
+    AusbildungAn,
+    Mitglied,
+    Gewinnt,
+    WissenschaftsaustauschIn,
+]
+
+
+def refresh_search_index_on_commit(person_ids):
+    person_ids = set(person_ids)
+    if person_ids:
+        transaction.on_commit(lambda: refresh_person_search_index(person_ids))
+
+
+@receiver(post_save, sender=Person)
+def person_saved(sender, instance, **kwargs):
+    refresh_search_index_on_commit([instance.pk])
+
+
+def refresh_candidates_on_commit(kinds, object_ids):
+    object_ids = set(object_ids) - {None}
+    if not object_ids:
+        return
+    transaction.on_commit(
+        lambda: [refresh_candidates(kind, object_ids) for kind in kinds]
+    )
+
+
+def candidate_objects(person_id):
+    """the objects of the relations of *person_id* that autocompletes may offer"""
+    object_ids = set()
+    for model_name, _ in CANDIDATE_RELATIONS.values():
+        object_ids |= set(
+            apps.get_model("apis_ontology", model_name)
+            .objects.filter(subj_object_id=person_id)
+            .values_list("obj_object_id", flat=True)
+        )
+    return object_ids
+
+
+@receiver(post_save, sender=Person)
+def person_candidates_changed(sender, instance, **kwargs):
+    """the objects of a member's relations are offered by the autocompletes"""
+    refresh_candidates_on_commit(CANDIDATE_RELATIONS, candidate_objects(instance.pk))
+
+
+@receiver(pre_delete, sender=Person)
+def person_candidates_deleted(sender, instance, **kwargs):
+    """read before apis detaches the relations of the deleted person"""
+    refresh_candidates_on_commit(CANDIDATE_RELATIONS, candidate_objects(instance.pk))
+
+
+def candidate_relation_saving(sender, instance, **kwargs):
+    """remember the object of the relation before it changes"""
+    instance._previous_obj_object_id = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("obj_object_id", flat=True)
+        .first()
+        if instance.pk is not None
+        else None
+    )
+
+
+def candidate_relation_changed(sender, instance, **kwargs):
+    kinds = [
+        kind
+        for kind, (model_name, _) in CANDIDATE_RELATIONS.items()
+        if model_name == sender._meta.model_name
+    ]
+    refresh_candidates_on_commit(
+        kinds,
+        [
+            instance.obj_object_id,
+            getattr(instance, "_previous_obj_object_id", None),
+        ],
+    )
+
+
+for model_name, _ in CANDIDATE_RELATIONS.values():
+    relation = apps.get_model("apis_ontology", model_name)
+    pre_save.connect(candidate_relation_saving, sender=relation)
+    post_save.connect(candidate_relation_changed, sender=relation)
+    post_delete.connect(candidate_relation_changed, sender=relation)
+
+
+def bump_search_index_version_on_commit():
+    transaction.on_commit(lambda: DataVersion.objects.bump(SEARCH_INDEX_VERSION))
+
+
+@receiver(m2m_changed, sender=Person.beruf.through)
+def person_beruf_changed(sender, action, **kwargs):
+    """the profession facet reads `Person.beruf` directly, not from the index"""
+    if action.startswith("post_"):
+        bump_search_index_version_on_commit()
+
+
+@receiver(post_save, sender=Beruf)
+def beruf_saved(sender, instance, **kwargs):
+    bump_search_index_version_on_commit()
+
+
+def search_index_relation_changed(sender, instance, **kwargs):
+    refresh_search_index_on_commit(
+        [instance.subj_object_id] if instance.subj_object_id else []
+    )
+
+
+for relation in SEARCH_INDEX_RELATIONS:
+    post_save.connect(search_index_relation_changed, sender=relation)
+    post_delete.connect(search_index_relation_changed, sender=relation)
+
+
+def refresh_academy_prizes(pks):
+    """store `Preis.academy_prize` of the prizes *pks*
+
+    Prizes whose flag changed are shown differently wherever they are
+    linked, so the pages of their relations and the entity links expire.
+    """
+    changed = Preis.objects.refresh_academy_prize(pks)
+    if changed:
+        transaction.on_commit(lambda: DataVersion.objects.bump(DataVersion.ONTOLOGY))
+        bump_entity_versions_on_commit(lambda: set(changed) | related_entities(changed))
+
+
+@receiver(post_save, sender=Institution)
+def institution_saved(sender, instance, **kwargs):
+    """typ, label and `akademie_institution` feed into the index of related persons"""
+    refresh_academy_prizes(
+        WirdVergebenVon.objects.filter(obj_object_id=instance.pk).values_list(
+            "subj_object_id", flat=True
+        )
+    )
+    person_ids = []
+    for relation in [PositionAn, Mitglied]:
+        person_ids += relation.objects.filter(obj_object_id=instance.pk).values_list(
+            "subj_object_id", flat=True
+        )
+    person_ids += Gewinnt.objects.filter(
+        obj_object_id__in=WirdVergebenVon.objects.filter(
+            obj_object_id=instance.pk
+        ).values("subj_object_id")
+    ).values_list("subj_object_id", flat=True)
+    refresh_search_index_on_commit(person_ids)
+
+
+@receiver(pre_delete, sender=Institution)
+def institution_deleted(sender, instance, **kwargs):
+    """the units below *instance* lose the institutions above it
+
+    The relations of a deleted entity are detached by apis without saving
+    them, so `hierarchy_relation_changed` does not run for them.
+    """
+    below = list(
+        InstitutionClosure.objects.filter(ancestor=instance).values_list(
+            "descendant_id", flat=True
+        )
+    )
+    if below:
+        transaction.on_commit(lambda: InstitutionClosure.objects.refresh(below))
+
+
+@receiver(pre_save, sender=InstitutionHierarchie)
+def hierarchy_relation_saving(sender, instance, **kwargs):
+    """remember the unit placed by the relation before it changes"""
+    previous = (
+        InstitutionHierarchie.objects.filter(pk=instance.pk)
+        .values_list("relation", "subj_object_id", "obj_object_id")
+        .first()
+        if instance.pk is not None
+        else None
+    )
+    instance._previous_structure_child = (
+        structure_child(*previous) if previous is not None else None
+    )
+
+
+@receiver(post_save, sender=InstitutionHierarchie)
+@receiver(post_delete, sender=InstitutionHierarchie)
+def hierarchy_relation_changed(sender, instance, **kwargs):
+    """the unit placed by the relation, before and after, and the units below"""
+    children = {
+        instance.structure_child(),
+        getattr(instance, "_previous_structure_child", None),
+    } - {None}
+    if children:
+        transaction.on_commit(
+            lambda: InstitutionClosure.objects.refresh_below(children)
+        )
+
+
+@receiver(post_delete, sender=Institution)
+def institution_removed(sender, instance, **kwargs):
+    """the prizes awarded by *instance* may no longer be academy prizes"""
+    refresh_academy_prizes([])
+
+
+@receiver(post_save, sender=Preis)
+def preis_saved(sender, instance, **kwargs):
+    refresh_search_index_on_commit(
+        Gewinnt.objects.filter(obj_object_id=instance.pk).values_list(
+            "subj_object_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=WirdVergebenVon)
+@receiver(post_delete, sender=WirdVergebenVon)
+def wird_vergeben_von_changed(sender, instance, **kwargs):
+    """a prize becomes (or stops being) an academy prize"""
+    refresh_academy_prizes([instance.subj_object_id])
+    refresh_search_index_on_commit(
+        Gewinnt.objects.filter(obj_object_id=instance.subj_object_id).values_list(
+            "subj_object_id", flat=True
+        )
+    )
+
+
+def refresh_proposals_on_commit(relation_ids):
+    relation_ids = set(relation_ids)
+    if relation_ids:
+        transaction.on_commit(lambda: Wahlvorschlag.objects.refresh(relation_ids))
+
+
+@receiver(post_save, sender=OeawMitgliedschaft)
+@receiver(post_save, sender=NichtGewaehlt)
+def proposal_relation_saved(sender, instance, **kwargs):
+    """the candidate, membership and date of a relation are kept in `Wahlvorschlag`"""
+    refresh_proposals_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=OeawMitgliedschaft)
+@receiver(post_delete, sender=NichtGewaehlt)
+def proposal_relation_deleted(sender, instance, **kwargs):
+    """the proposals of a deleted relation are removed"""
+    refresh_proposals_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=OeawMitgliedschaft.vorgeschlagen_von.through)
+@receiver(m2m_changed, sender=NichtGewaehlt.vorgeschlagen_von.through)
+def proposers_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        relation_ids = [instance.pk]
+    elif pk_set:
+        relation_ids = list(pk_set)
+    else:
+        # cleared from the side of the proposer, read before the refresh
+        relation_ids = list(
+            Wahlvorschlag.objects.filter(proposer=instance).values_list(
+                "relation_id", flat=True
+            )
+        )
+    refresh_proposals_on_commit(relation_ids)
+
+
+def name_variants_changed(sender, instance, **kwargs):
+    refresh_name_variants(sender, [instance.pk])
+
+
+for model_name in NAME_FIELDS:
+    post_save.connect(
+        name_variants_changed, sender=apps.get_model("apis_ontology", model_name)
+    )
+
+
+# the data shown outside of the detail pages of the entities involved: in the
+# search results, facets, autocompletes, hierarchies and entity links
+SHARED_MODELS = {
+    Person,
+    Institution,
+    Ort,
+    Preis,
+    Beruf,
+    InstitutionHierarchie,
+    WirdVergebenVon,
+    NichtGewaehlt,
+    *SEARCH_INDEX_RELATIONS,
+    *(
+        apps.get_model("apis_ontology", model_name)
+        for model_name, _ in CANDIDATE_RELATIONS.values()
+    ),
+    Person.beruf.through,
+    OeawMitgliedschaft.vorgeschlagen_von.through,
+    NichtGewaehlt.vorgeschlagen_von.through,
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def ontology_changed(sender, **kwargs):
+    """bump the `DataVersion.ONTOLOGY` version on every change of shared data
+
+    Changes of other data only show on the detail pages of the entities
+    involved, which have versions of their own, see `entity_page_changed`.
+    """
+    if sender not in SHARED_MODELS:
+        return
+    if kwargs.get("action", "post_").startswith("post_"):
+        transaction.on_commit(lambda: DataVersion.objects.bump(DataVersion.ONTOLOGY))
+
+
+@receiver(post_save, sender=Uri)
+@receiver(post_delete, sender=Uri)
+def uri_changed(sender, **kwargs):
+    """GND URIs are part of the entity links cached in `mine_frontend.links`"""
+    transaction.on_commit(lambda: DataVersion.objects.bump(DataVersion.ONTOLOGY))
+
+
+def bump_entity_versions_on_commit(pks):
+    """invalidate the cached detail pages and dossiers of the entities *pks*
+
+    *pks* can also be a function returning them, which then only runs
+    after the commit, so that the queries finding the pages do not hold
+    up the save.
+    """
+
+    def bump():
+        entities = {pk for pk in (pks() if callable(pks) else pks) if pk}
+        if entities:
+            DataVersion.objects.bump(*[DataVersion.entity(pk) for pk in entities])
+            PersonDossier.objects.filter(person_id__in=entities).update(stale=True)
+
+    transaction.on_commit(bump)
+
+
+def related_entities(pks):
+    """the entities in a relation with any of *pks*"""
+    if not pks:
+        return set()
+    rows = Relation.objects.filter(
+        Q(subj_object_id__in=pks) | Q(obj_object_id__in=pks)
+    ).values_list("subj_object_id", "obj_object_id")
+    return {pk for row in rows for pk in row}
+
+
+def lineage_entities(pks):
+    """the institutions whose pages show the hierarchy of any of *pks*
+
+    Read after the commit, the lineages of both ends of a hierarchy
+    relation together still hold every page that lost an institution.
+    """
+    return {row.obj_id for pk in pks for row in institution_lineage(pk)}
+
+
+def page_entities(model, pks):
+    """the entities whose detail pages show the *model* instances *pks*"""
+    if issubclass(model, Relation):
+        rows = model.objects.filter(pk__in=pks).values_list(
+            "subj_object_id", "obj_object_id"
+        )
+        return {pk for row in rows for pk in row}
+    if issubclass(model, RootObject):
+        return set(pks)
+    return set()
+
+
+# relations also shown on the pages of their proposers
+PROPOSAL_MODELS = (OeawMitgliedschaft, NichtGewaehlt)
+
+
+def proposers(relation):
+    return set(relation.vorgeschlagen_von.values_list("pk", flat=True))
+
+
+def m2m_targets(through, instance, model):
+    """the pks of the *model* instances linked to *instance* by *through*"""
+    fields = [field for field in through._meta.fields if field.is_relation]
+    source = next(field for field in fields if field.related_model is type(instance))
+    target = next(
+        field
+        for field in fields
+        if field.related_model is model and field is not source
+    )
+    return through.objects.filter(**{source.name: instance.pk}).values_list(
+        target.attname, flat=True
+    )
+
+
+def entity_pages(sender, instance):
+    """the entities whose detail pages show *instance*, see `entity_page_changed`"""
+    if issubclass(sender, RootObject):
+        # labels and links of an entity show up on the pages of its relations
+        pks = {instance.pk} | related_entities([instance.pk])
+        if sender is Institution:
+            pks |= lineage_entities([instance.pk])
+        if sender is Fach:
+            pks |= page_entities(PositionAn, instance.positionan_set.values("pk"))
+            pks |= page_entities(AusbildungAn, instance.ausbildungan_set.values("pk"))
+        return pks
+    if sender is Beruf:
+        return set(Person.objects.filter(beruf=instance).values_list("pk", flat=True))
+    return set()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def entity_page_changed(sender, instance, signal, **kwargs):
+    """bump the versions of the detail pages that show *instance*
+
+    The pages are looked up after the commit, except for deleted entities
+    and professions, see `entity_page_deleted`.
+    """
+    if sender._meta.app_label != "apis_ontology":
+        return
+    if issubclass(sender, Relation):
+        pks = {instance.subj_object_id, instance.obj_object_id}
+        # texts list the persons mentioned in them on the pages of their authors
+        werke = [
+            pk
+            for pk, content_type_id in [
+                (instance.subj_object_id, instance.subj_content_type_id),
+                (instance.obj_object_id, instance.obj_content_type_id),
+            ]
+            if content_type_id
+            and ContentType.objects.get_for_id(content_type_id).model_class() is Werk
+        ]
+        institutions = pks if sender is InstitutionHierarchie else set()
+        # the proposers of a deleted relation are read in `entity_page_deleted`
+        proposed = sender in PROPOSAL_MODELS and signal is post_save
+        bump_entity_versions_on_commit(
+            lambda: pks
+            | related_entities(werke)
+            | lineage_entities(institutions - {None})
+            | (proposers(instance) if proposed else set())
+        )
+    elif issubclass(sender, RootObject) or sender is Beruf:
+        if signal is post_save:
+            bump_entity_versions_on_commit(lambda: entity_pages(sender, instance))
+    elif sender is Bild:
+        bump_entity_versions_on_commit([instance.object_id])
+
+
+@receiver(pre_delete)
+def entity_page_deleted(sender, instance, **kwargs):
+    """the pages showing an entity, profession or proposal, read before it is detached
+
+    apis detaches the relations of a deleted entity, the profession of
+    persons is removed with it and the proposers of a relation are removed
+    without `m2m_changed`, so the pages are collected beforehand.
+    """
+    if sender._meta.app_label != "apis_ontology":
+        return
+    if issubclass(sender, RootObject) or sender is Beruf:
+        bump_entity_versions_on_commit(entity_pages(sender, instance))
+    elif sender in PROPOSAL_MODELS:
+        bump_entity_versions_on_commit(proposers(instance))
+
+
+@receiver(m2m_changed)
+def entity_page_m2m_changed(sender, instance, action, model, pk_set, **kwargs):
+    if instance._meta.app_label != "apis_ontology":
+        return
+    if action == "pre_clear":
+        # `post_clear` does not tell which objects were removed
+        bump_entity_versions_on_commit(
+            page_entities(model, list(m2m_targets(sender, instance, model)))
+        )
+    if not action.startswith("post_"):
+        return
+
+    def pages():
+        pks = page_entities(type(instance), [instance.pk])
+        if pk_set:
+            pks |= page_entities(model, pk_set)
+        return pks
+
+    bump_entity_versions_on_commit(pages)
+
+
+@receiver(post_save, sender=Uri)
+@receiver(post_delete, sender=Uri)
+def uri_entity_page_changed(sender, instance, **kwargs):
+    """the reference list and GND links of an entity are built from its URIs"""
+    bump_entity_versions_on_commit(
+        lambda: {instance.object_id} | related_entities([instance.object_id])
+    )
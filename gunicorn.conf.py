@@ -0,0 +1,14 @@
+# Load the app in the master process so that the facet bitsets built below
+# are shared copy-on-write by all workers.
+preload_app = True
+
+
+def when_ready(server):
+    from django.db import connections
+
+    from mine_frontend.bitsets import preload
+    from mine_frontend.views import PersonResultsView
+
+    preload(PersonResultsView)
+    # the forked workers must not share the connection of the master
+    connections.close_all()
@@ -0,0 +1,172 @@
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+from apis_ontology.models import DataVersion
+
+# matches returned by `AutocompleteIndex.search`, the first pages of a dropdown
+AUTOCOMPLETE_LIMIT = 100
+
+
+def normalize(text):
+    """*text* case-folded and without accents, like `search_text` in Postgres"""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SortedNames:
+    """names with the entity they belong to, sorted for prefix lookups"""
+
+    def __init__(self, names):
+        names.sort()
+        self.names = [name for name, _ in names]
+        self.entity_of = [entity for _, entity in names]
+
+    def entities(self, prefix):
+        """the entities with a name starting with *prefix*"""
+        start = bisect_left(self.names, prefix)
+        end = bisect_left(self.names, prefix + "\U0010ffff", start)
+        return set(self.entity_of[start:end])
+
+
+class AutocompleteIndex:
+    """Name variants of the entities of a queryset, held in memory.
+
+    The entities are numbered in the order of their normalized primary
+    name.  Every name variant is an entry; the entries and the rest of the
+    entries from each further word on are kept in `SortedNames` for prefix
+    lookups, and the entries in a trigram inverted index.  `search` finds
+    the entities with a name containing the query, like the
+    ``search_name__contains`` filter of `filter_names`; shorter queries
+    than a trigram only match at the start of a word.
+    """
+
+    def __init__(self, queryset, version=0):
+        self.version = version
+        rows = []
+        for pk, names in queryset.order_by().values_list("pk", "name_variants__names"):
+            names = [normalize(name) for name in (names or "").split("\n")]
+            rows.append((names[0], pk, [name for name in names if name]))
+        rows.sort()
+        self.pks = [pk for _, pk, _ in rows]
+        self.names = []
+        self.entities = []
+        self.postings = defaultdict(list)
+        starts, words = [], []
+        for entity, (_, _, names) in enumerate(rows):
+            for name in names:
+                for trigram in trigrams(name):
+                    self.postings[trigram].append(len(self.names))
+                starts.append((name, entity))
+                words += [
+                    (name[i:], entity)
+                    for i in range(1, len(name))
+                    if name[i - 1] == " "
+                ]
+                self.names.append(name)
+                self.entities.append(entity)
+        self.starts = SortedNames(starts)
+        self.words = SortedNames(words)
+
+    def candidates(self, q):
+        """the entries that can contain *q*, by its trigrams, in order"""
+        if len(q) < 3:
+            return []
+        postings = sorted((self.postings.get(t, []) for t in trigrams(q)), key=len)
+        entries = set(postings[0])
+        for posting in postings[1:]:
+            entries.intersection_update(posting)
+        return sorted(entries)
+
+    def search(self, q, limit=AUTOCOMPLETE_LIMIT):
+        """the primary keys of up to *limit* entities with a name containing *q*
+
+        Names starting with *q* come first, then those with a word starting
+        with *q*, then the others, each in the order of the primary names.
+        """
+        q = normalize(q)
+        found = sorted(self.starts.entities(q))[:limit]
+        seen = set(found)
+        if len(found) < limit:
+            words = self.words.entities(q) - seen
+            found += sorted(words)[: limit - len(found)]
+            seen |= words
+        # the names containing *q* inside a word, in the order of the entities
+        for entry in self.candidates(q):
+            if len(found) >= limit:
+                break
+            entity = self.entities[entry]
+            if entity not in seen and q in self.names[entry]:
+                seen.add(entity)
+                found.append(entity)
+        return [self.pks[entity] for entity in found]
+
+
+class IndexedResults:
+    """The entities *pks* of *queryset*, in that order, for a paginator.
+
+    Only the entities of the requested page are read from the database.
+    """
+
+    def __init__(self, queryset, pks):
+        self.queryset = queryset
+        self.pks = pks
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __getitem__(self, key):
+        pks = self.pks[key] if isinstance(key, slice) else [self.pks[key]]
+        entities = self.queryset.in_bulk(pks)
+        results = [entities[pk] for pk in pks if pk in entities]
+        return results if isinstance(key, slice) else results[0]
+
+
+class AutocompleteIndexBackend:
+    """Optional in-memory search of an autocomplete view.
+
+    Holds one `AutocompleteIndex` per process over the view's
+    ``get_base_queryset``.  While the index is missing or older than the
+    `DataVersion` counter *version_key*, `search` returns ``None`` so the
+    view queries the database, and the index is rebuilt in a background
+    thread.  Enabled by the ``MINE_AUTOCOMPLETE_INDEX`` setting.
+    """
+
+    def __init__(self, version_key=DataVersion.ONTOLOGY):
+        self.version_key = version_key
+        self.index = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return getattr(settings, "MINE_AUTOCOMPLETE_INDEX", False)
+
+    def build(self, queryset, version):
+        try:
+            self.index = AutocompleteIndex(queryset, version)
+        finally:
+            # the connections of this thread
+            connections.close_all()
+            self.lock.release()
+
+    def search(self, view, q):
+        """the ranked primary keys matching *q*, or ``None`` if not available"""
+        version = DataVersion.objects.current(self.version_key)
+        index = self.index
+        if index is not None and index.version == version:
+            return index.search(q)
+        if self.lock.acquire(blocking=False):
+            threading.Thread(
+                target=self.build,
+                args=(view.get_base_queryset(), version),
+                daemon=True,
+            ).start()
+        return None
@@ -1,103 +1,110 @@
+from abc import ABCMeta, abstractmethod
+
 from dal import autocomplete
-from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.db.models import Value
+from django.utils.decorators import method_decorator
 
 from apis_ontology.models import (
-    AusbildungAn,
-    GeborenIn,
-    GestorbenIn,
     Institution,
     Ort,
     Person,
-    PositionAn,
     Preis,
-    WissenschaftsaustauschIn,
+    Wahlvorschlag,
+    search_text,
 )
+from apis_ontology.name_variants import search_names
+from mine_frontend.autocomplete_index import AutocompleteIndexBackend, IndexedResults
+from mine_frontend.cache import cache_response
 
 
-class VorschlagendeDal(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        if self.q:
-            return Person.objects.filter(
-                Q(Q(forename__icontains=self.q) | Q(surname__icontains=self.q)),
-                vorgeschlagen_von_set__isnull=False,
-            ).distinct()
-        else:
-            return Person.objects.filter(vorgeschlagen_von_set__isnull=False).distinct()
+def filter_names(queryset, q):
+    """the entities of *queryset* with a name variant containing *q*"""
+    return queryset.alias(search_name=search_names()).filter(
+        search_name__contains=search_text(Value(q))
+    )
 
 
-class OEAWInstitutionsDal(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        inst = Institution.objects.filter(akademie_institution=True)
-        if self.q:
-            inst = inst.filter(label__icontains=self.q)
-        return inst
+@method_decorator(cache_response, name="get")
+class IndexedDal(autocomplete.Select2QuerySetView, metaclass=ABCMeta):
+    """autocomplete over `get_base_queryset`, searched in memory if enabled"""
+
+    # optional `mine_frontend.autocomplete_index.AutocompleteIndexBackend`
+    index = None
 
+    @abstractmethod
+    def get_base_queryset(self):
+        """the entities offered, before filtering by the search term"""
 
-class OEAWPrizesDal(autocomplete.Select2QuerySetView):
     def get_queryset(self):
-        preis = Preis.objects.filter(academy_prize=True)
-        if self.q:
-            preis = preis.filter(name__icontains=self.q)
-        return preis
+        queryset = self.get_base_queryset()
+        if not self.q:
+            return queryset
+        if self.index is not None and self.index.enabled:
+            pks = self.index.search(self, self.q)
+            if pks is not None:
+                return IndexedResults(queryset, pks)
+        return filter_names(queryset, self.q)
+
+
+class VorschlagendeDal(IndexedDal):
+    index = AutocompleteIndexBackend()
+
+    def get_base_queryset(self):
+        proposers = Wahlvorschlag.objects.filter(success=True).values("proposer")
+        return Person.objects.filter(pk__in=proposers)
+
 
+class OEAWInstitutionsDal(IndexedDal):
+    index = AutocompleteIndexBackend()
 
-class RelDalBase(autocomplete.Select2QuerySetView):
-    class_for_relation = None
+    def get_base_queryset(self):
+        return Institution.objects.filter(akademie_institution=True)
+
+
+class OEAWPrizesDal(IndexedDal):
+    index = AutocompleteIndexBackend()
+
+    def get_base_queryset(self):
+        return Preis.objects.filter(academy_prize=True)
+
+
+class RelDalBase(IndexedDal):
+    """entities connected to a member, see `apis_ontology.candidates`"""
+
+    candidates = None
     class_fin = None
-    query_param = "label__icontains"
-    add_qp_rel = None
-    add_qp = None
 
-    def get_queryset(self):
-        mitgld = Person.objects.filter(
-            id=OuterRef("subj_object_id"), mitglied=True
-        ).values_list("id", flat=True)
-        rel = (
-            self.class_for_relation.objects.annotate(
-                mitgld=Case(When(Exists(mitgld), then=Value(True)), default=Value(None))
-            )
-            .filter(obj_object_id=OuterRef("pk"), mitgld__isnull=False)
-            .values_list("id", flat=True)
+    def get_base_queryset(self):
+        return self.class_fin.objects.filter(
+            autocomplete_candidates__kind=self.candidates
         )
-        if self.add_qp_rel:
-            q = Q()
-            for param, value in self.add_qp_rel:
-                q &= Q(**{param: value})
-            rel = rel.filter(q)
-        res = self.class_fin.objects.annotate(
-            rel=Case(When(Exists(rel), then=Value(True)), default=Value(None))
-        ).filter(rel__isnull=False)
-        if self.add_qp:
-            q = Q()
-            for param, value in self.add_qp:
-                q &= Q(**{param: value})
-            res = res.filter(q)
-        if self.q:
-            res = res.filter(**{self.query_param: self.q})
-        return res
 
 
 class GeburtsorteDal(RelDalBase):
-    class_for_relation = GeborenIn
+    candidates = "geburtsort"
     class_fin = Ort
+    index = AutocompleteIndexBackend()
 
 
 class SterbeorteDal(RelDalBase):
-    class_for_relation = GestorbenIn
+    candidates = "sterbeort"
     class_fin = Ort
+    index = AutocompleteIndexBackend()
 
 
 class AusbildungUniDal(RelDalBase):
-    class_for_relation = AusbildungAn
+    candidates = "ausbildung"
     class_fin = Institution
-    add_qp_rel = [("typ__in", ["Studium", "Promotion", "Habilitation"])]
+    index = AutocompleteIndexBackend()
 
 
 class InstitutionBerufDal(RelDalBase):
-    class_for_relation = PositionAn
+    candidates = "institution_beruf"
     class_fin = Institution
+    index = AutocompleteIndexBackend()
 
 
 class WissenschaftsaustauschDal(RelDalBase):
-    class_for_relation = WissenschaftsaustauschIn
+    candidates = "wissenschaftsaustausch"
     class_fin = Ort
+    index = AutocompleteIndexBackend()
@@ -0,0 +1,139 @@
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import F
+
+from apis_ontology.models import DataVersion
+
+
+class BitsetFacetIndex:
+    """Facet values of a queryset held in memory as bitsets.
+
+    Every row of the queryset gets a bit position, in the order of the
+    primary keys.  The bitsets of the values of a facet are stored in one
+    ``array("Q")`` of *words* machine words each, so the index is a few
+    buffers that the workers forked from the gunicorn master share
+    copy-on-write: reading a bitset touches no reference count inside the
+    buffer.  A bitset is read into an ``int`` for the duration of an
+    operation; filtering is ``&`` / ``|`` on those and counting is
+    ``int.bit_count``.  Only ``exact`` facet lookups are supported.
+    """
+
+    def __init__(self, queryset, facet_fields, version=0):
+        self.version = version
+        self.facet_fields = facet_fields
+        columns = {key: F(config["field"]) for key, config in facet_fields.items()}
+        rows = list(queryset.order_by("pk").values_list("pk", *columns.values()))
+        # a row per pk, unless the facet fields join rows of other tables
+        self.pks = array("q", sorted({row[0] for row in rows}))
+        positions = [bisect_left(self.pks, row[0]) for row in rows]
+        self.words = (len(self.pks) + 63) // 64
+        self.all = (1 << len(self.pks)) - 1
+        self.values = {}
+        self.bitsets = {}
+        for column, key in enumerate(columns, 1):
+            bitsets = {}
+            array_field = facet_fields[key].get("type", "choice") == "array"
+            for position, row in zip(positions, rows):
+                value = row[column]
+                if value is None:
+                    continue
+                for element in value if array_field else [value]:
+                    element = str(element)
+                    bitsets[element] = bitsets.get(element, 0) | 1 << position
+            self.values[key] = {value: i for i, value in enumerate(bitsets)}
+            self.bitsets[key] = array("Q")
+            for bitset in bitsets.values():
+                self.bitsets[key].frombytes(bitset.to_bytes(self.words * 8, "little"))
+
+    def bitset(self, key, value):
+        """the bitset of *value* of the facet *key* as an ``int``"""
+        i = self.values[key].get(value)
+        if i is None:
+            return 0
+        words = memoryview(self.bitsets[key])[i * self.words : (i + 1) * self.words]
+        return int.from_bytes(words, "little")
+
+    def mask(self, pks):
+        """bitset of the rows in *pks*; unknown primary keys are ignored"""
+        mask = 0
+        for pk in pks:
+            position = bisect_left(self.pks, pk)
+            if position < len(self.pks) and self.pks[position] == pk:
+                mask |= 1 << position
+        return mask
+
+    def filter(self, mask, selected, exclude=None):
+        """restrict *mask* to the rows matching the *selected* facet values
+
+        Values of one facet are OR-combined, or AND-combined for array facets
+        configured with ``"match": "all"``; facets are AND-combined.  The
+        selection of the facet *exclude* is ignored.
+        """
+        for key, values in selected.items():
+            if key == exclude or key not in self.bitsets or not values:
+                continue
+            bitsets = [self.bitset(key, value) for value in values]
+            if self.facet_fields[key].get("match", "any") == "all":
+                for bitset in bitsets:
+                    mask &= bitset
+            else:
+                combined = 0
+                for bitset in bitsets:
+                    combined |= bitset
+                mask &= combined
+        return mask
+
+    def count(self, mask, selected):
+        """Return ``(total, counts)`` like :func:`mine_frontend.facets.count_facets`.
+
+        Each facet is counted within *mask* restricted by the selections of
+        all other facets.
+        """
+        counts = {}
+        for key, values in self.values.items():
+            facet_mask = self.filter(mask, selected, exclude=key)
+            found = []
+            for value in values:
+                if count := (self.bitset(key, value) & facet_mask).bit_count():
+                    found.append((value, count))
+            counts[key] = sorted(found, key=lambda item: (-item[1], item[0]))
+        return self.filter(mask, selected).bit_count(), counts
+
+
+class BitsetFacetBackend:
+    """Optional facet backend of a `FacetedSearchMixin` view.
+
+    Holds one `BitsetFacetIndex` per process.  The index is rebuilt
+    whenever the `DataVersion` counter *version_key* changes.  Enabled by
+    the ``MINE_BITSET_FACETS`` setting.
+    """
+
+    def __init__(self, version_key):
+        self.version_key = version_key
+        self.index = None
+
+    @property
+    def enabled(self):
+        return getattr(settings, "MINE_BITSET_FACETS", False)
+
+    def get_index(self, view):
+        version = DataVersion.objects.current(self.version_key)
+        if self.index is None or self.index.version != version:
+            self.index = BitsetFacetIndex(
+                view.get_base_queryset(), view.get_facet_fields(), version
+            )
+        return self.index
+
+
+def preload(*view_classes):
+    """build the bitset indexes of *view_classes*
+
+    Meant to run in the gunicorn master before the workers are forked, so
+    that all workers share the memory pages of the index.
+    """
+    for view_class in view_classes:
+        backend = view_class.facet_backend
+        if backend is not None and backend.enabled:
+            backend.get_index(view_class())
@@ -0,0 +1,174 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+from apis_ontology.models import DataVersion
+
+CACHE_TIMEOUT = 60 * 60 * 24
+# whole responses, see `cache_response`
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+# parameters that change neither the facet counts nor the number of results
+IGNORED_PARAMS = {"page", "sort", "per_page", "cursor"}
+KINDS = ("facets", "count", "responses")
+STATS = ("hits", "misses")
+_MISSING = object()
+
+
+def canonical_params(query_dict, ignored=IGNORED_PARAMS):
+    """the GET parameters as a stable string: sorted, deduplicated, no empty values"""
+    return urlencode(
+        [
+            (key, value)
+            for key in sorted(query_dict)
+            if key not in ignored
+            for value in sorted({value for value in query_dict.getlist(key) if value})
+        ]
+    )
+
+
+def data_version(request):
+    """the `DataVersion.ONTOLOGY` version, read once per request"""
+    if not hasattr(request, "_mine_data_version"):
+        request._mine_data_version = DataVersion.objects.current(DataVersion.ONTOLOGY)
+    return request._mine_data_version
+
+
+def cache_key(kind, view):
+    """cache key of *kind* for the view class and filter state of *view*
+
+    The key contains the current `DataVersion.ONTOLOGY` version, so every
+    change of the data invalidates all keys without touching the cache.
+    """
+    request = view.request
+    digest = hashlib.sha256(canonical_params(request.GET).encode()).hexdigest()
+    return (
+        f"mine_frontend:{kind}:{type(view).__name__}:{data_version(request)}:{digest}"
+    )
+
+
+def response_cache_key(request):
+    """cache key of the response to *request*, like `cache_key` for all parameters"""
+    params = canonical_params(request.GET, ignored=())
+    digest = hashlib.sha256(f"{request.path}?{params}".encode()).hexdigest()
+    return f"mine_frontend:response:{get_language()}:{data_version(request)}:{digest}"
+
+
+def _stat_key(kind, stat):
+    return f"mine_frontend:stats:{kind}:{stat}"
+
+
+def _record(kind, stat):
+    key = _stat_key(kind, stat)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_or_compute(kind, view, compute):
+    """return the cached value of *kind* for *view*, computing it on a miss"""
+    key = cache_key(kind, view)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        _record(kind, "misses")
+        value = compute()
+        cache.set(key, value, CACHE_TIMEOUT)
+    else:
+        _record(kind, "hits")
+    return value
+
+
+def cache_response(view):
+    """Serve the successful ``GET`` responses of *view* from the cache.
+
+    The responses are cached for `RESPONSE_CACHE_TIMEOUT` under
+    `response_cache_key`, so a new version of the data is never served
+    stale, and replayed with their headers but without cookies.  They
+    carry a strong ETag, the hash of the content, and a request with a
+    matching ``If-None-Match`` gets a 304 without the view running at all.
+    The pages must not depend on the user, as they are shared between
+    users; apply this after the login check, e.g. to the ``get`` method of
+    a view class.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = response_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            _record("responses", "misses")
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+            if hasattr(response, "render"):
+                response.render()
+            etag = quote_etag(hashlib.sha256(response.content).hexdigest())
+            # cookies are kept in `response.cookies`, the rest is shared
+            headers = {
+                name: value
+                for name, value in response.items()
+                if name.lower() != "set-cookie"
+            }
+            cache.set(key, (etag, headers, response.content), RESPONSE_CACHE_TIMEOUT)
+        else:
+            _record("responses", "hits")
+            etag, headers, content = cached
+            response = HttpResponse(content, headers=headers)
+        response["ETag"] = etag
+        # shared between the logged in users, but revalidated on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
+
+    return wrapper
+
+
+def cache_stats():
+    """hit and miss counters and the hit ratio of every kind of cached value
+
+    The counters are kept in the default cache, so with a per-process
+    backend like `LocMemCache` they only count the requests of this process.
+    """
+    values = cache.get_many([_stat_key(kind, stat) for kind in KINDS for stat in STATS])
+    stats = {
+        kind: {stat: values.get(_stat_key(kind, stat), 0) for stat in STATS}
+        for kind in KINDS
+    }
+    for counters in stats.values():
+        total = counters["hits"] + counters["misses"]
+        counters["ratio"] = counters["hits"] / total if total else None
+    return stats
+
+
+def fragment_cache_context(entity):
+    """the context of the ``{% cache %}`` fragments of the detail page of *entity*
+
+    The fragments are keyed by the entity and its version, which is bumped
+    whenever something shown on the page changes, see `apis_ontology.signals`.
+    """
+    return {
+        "fragment_timeout": CACHE_TIMEOUT,
+        "entity_version": DataVersion.objects.current(DataVersion.entity(entity.pk)),
+    }
+
+
+class CountPaginator(Paginator):
+    """paginator that uses a precomputed *count* instead of querying it"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        if self._count is not None:
+            return self._count
+        return super().count
@@ -0,0 +1,213 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from apis_core.relations.models import Relation
+from apis_core.uris.models import Uri
+from django.db import connections, transaction
+from django.db.models import prefetch_related_objects
+
+from apis_ontology.models import (
+    Bild,
+    Person,
+    PersonDossier,
+)
+from mine_frontend.links import get_web_object_uri
+from mine_frontend.loaders import MEMBER_DETAIL, load_member_detail
+
+# fields of the mixins that are not part of the published data
+INTERNAL_FIELDS = {"notes", "references", "old_id"}
+
+
+def entity_data(entity):
+    if entity is None:
+        return None
+    return {"id": entity.pk, "type": entity._meta.model_name, "label": str(entity)}
+
+
+def fields_data(obj):
+    """the own fields of *obj*, with related objects as `entity_data`"""
+    data = {}
+    for field in obj._meta.get_fields():
+        if field.model is not type(obj) or (field.auto_created and field.is_relation):
+            continue
+        if field.name in INTERNAL_FIELDS:
+            continue
+        if field.many_to_many:
+            data[field.name] = [entity_data(e) for e in getattr(obj, field.name).all()]
+        elif field.many_to_one and field.concrete:
+            data[field.name] = entity_data(getattr(obj, field.name))
+        elif field.concrete:
+            data[field.name] = field.value_from_object(obj)
+    return data
+
+
+def related_fields(model):
+    """the names of the fields of *model* that `fields_data` follows"""
+    return [
+        field.name
+        for field in model._meta.get_fields()
+        if field.model is model
+        and not field.auto_created
+        and (field.many_to_many or field.many_to_one and field.concrete)
+    ]
+
+
+def collect_relations(values, relations):
+    """add the relations in *values* to *relations*, a list per model"""
+    for value in values:
+        if isinstance(value, Relation):
+            relations[type(value)].append(value)
+        elif isinstance(value, dict):
+            collect_relations(value.values(), relations)
+        elif isinstance(value, list):
+            collect_relations(value, relations)
+
+
+def relation_data(relation):
+    return {
+        "id": relation.pk,
+        "type": relation._meta.model_name,
+        "subj": entity_data(relation.subj),
+        "obj": entity_data(relation.obj),
+        **fields_data(relation),
+    }
+
+
+def image_data(image):
+    """the image URLs as shown by the ``image.html`` partial"""
+    if image.art == "Wikimedia":
+        url = thumb = image.pfad
+        srcset = ""
+    else:
+        url, thumb, srcset = image.img_url, image.thumb_img, image.srcset
+    return {
+        "art": image.art,
+        "credit": image.credit,
+        "url": url,
+        "thumb": thumb,
+        "srcset": srcset,
+    }
+
+
+def serialize(value):
+    if isinstance(value, Relation):
+        return relation_data(value)
+    if isinstance(value, Bild):
+        return image_data(value)
+    if isinstance(value, dict):
+        return {key: serialize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [serialize(item) for item in value]
+    return value
+
+
+def build_dossier(person):
+    """everything the detail page of *person* shows, as JSON data
+
+    The sections are those of `load_member_detail`, with relations as
+    their fields plus the subject and object, and the reference URIs.
+    """
+    context = load_member_detail(person)
+    relations = defaultdict(list)
+    collect_relations(context.values(), relations)
+    for model, rows in relations.items():
+        prefetch_related_objects(rows, *related_fields(model))
+    return {
+        "person": {
+            "id": person.pk,
+            "label": str(person),
+            **fields_data(person),
+        },
+        **{key: serialize(context.get(key)) for key in MEMBER_DETAIL},
+        "reference_resources": [
+            # `Uri.short_label` is a method that the templates call implicitly
+            {**get_web_object_uri(uri), "kind": uri.short_label()}
+            for uri in Uri.objects.filter(object_id=person.pk)
+        ],
+    }
+
+
+def refresh_dossiers(person_ids=None):
+    """store the `PersonDossier` of the members *person_ids*
+
+    Without *person_ids* every member gets a new dossier. Dossiers of
+    persons that are no longer members are removed. The dossiers are locked
+    while they are rebuilt, so marking them as stale waits for the rebuild
+    instead of being overwritten by it. Missing dossiers are committed as
+    stale placeholders first, as only existing rows can be locked. Returns
+    the number of dossiers written.
+    """
+    persons = Person.objects.filter(mitglied=True).order_by("pk")
+    dossiers = PersonDossier.objects.all()
+    if person_ids is not None:
+        person_ids = list(person_ids)
+        persons = persons.filter(pk__in=person_ids)
+        dossiers = dossiers.filter(person_id__in=person_ids)
+    PersonDossier.objects.bulk_create(
+        [
+            PersonDossier(person_id=pk, data={}, stale=True)
+            for pk in persons.filter(dossier__isnull=True).values_list("pk", flat=True)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    with transaction.atomic():
+        locked = set(dossiers.select_for_update().values_list("pk", flat=True))
+        dossiers.exclude(person__mitglied=True).delete()
+        # members without a placeholder are left to the next refresh
+        rows = [
+            PersonDossier(person=person, data=build_dossier(person), stale=False)
+            for person in persons
+            if person.pk in locked
+        ]
+        PersonDossier.objects.bulk_create(
+            rows,
+            batch_size=100,
+            update_conflicts=True,
+            unique_fields=["person"],
+            update_fields=["data", "stale", "updated"],
+        )
+    return len(rows)
+
+
+def pending_dossiers():
+    """the members whose dossier is missing or stale"""
+    return (
+        Person.objects.filter(mitglied=True)
+        .exclude(dossier__stale=False)
+        .values_list("pk", flat=True)
+    )
+
+
+def rebuild_dossiers(person_ids, workers=1, chunk_size=50):
+    """`refresh_dossiers` of *person_ids* in chunks, in *workers* processes
+
+    Dossiers of persons that are no longer members are removed first.
+    Returns the number of dossiers written.
+    """
+    PersonDossier.objects.exclude(person__mitglied=True).delete()
+    person_ids = list(person_ids)
+    chunks = [
+        person_ids[i : i + chunk_size] for i in range(0, len(person_ids), chunk_size)
+    ]
+    if workers <= 1 or len(chunks) <= 1:
+        return sum(map(refresh_dossiers, chunks))
+    # the forked workers must not share the connection of this process
+    connections.close_all()
+    with ProcessPoolExecutor(workers, mp_context=get_context("fork")) as pool:
+        return sum(pool.map(refresh_dossiers, chunks))
+
+
+def get_dossier(person):
+    """the dossier of *person*, built on the fly if it is missing or stale
+
+    Stored dossiers are only written by `rebuild_dossiers`, e.g. by
+    ``manage.py rebuild_dossiers --watch``.
+    """
+    data = (
+        PersonDossier.objects.filter(person=person, stale=False)
+        .values_list("data", flat=True)
+        .first()
+    )
+    return data if data is not None else build_dossier(person)
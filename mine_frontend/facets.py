@@ -0,0 +1,95 @@
+from django.db import connections
+from django.db.models import F
+
+FACET_TYPES = ("choice", "array")
+
+
+def _column(key):
+    return f"_facet_{key}"
+
+
+def _predicate(config, column, values):
+    """SQL matching the rows of the CTE that have one of *values* in *column*"""
+    if config.get("type", "choice") == "choice":
+        return f'"{column}"::text = ANY(%s)', [values]
+    operator = "@>" if config.get("match", "any") == "all" else "&&"
+    return f'"{column}"::text[] {operator} %s::text[]', [values]
+
+
+def count_facets(queryset, facet_fields, selected=None):
+    """Count the values of all facets in *facet_fields* in one round trip.
+
+    The *queryset* (without any facet filters) is evaluated once as a
+    materialized CTE holding the primary key and one column per facet.
+    Every ``choice`` facet is then grouped by its column and every ``array``
+    facet by the unnested elements of its column; all branches are combined
+    with ``UNION ALL`` so the whole sidebar is a single statement.
+
+    *selected* maps facet keys to the selected values, which are matched
+    exactly.  Each facet is counted with the selections of all *other*
+    facets applied, so a facet with a selection still lists its
+    alternatives (disjunctive faceting).
+
+    Returns a tuple ``(total, counts)`` where *total* is the number of
+    distinct rows matching all selections and *counts* maps each facet key
+    to a list of ``(value, count)`` tuples, ordered by descending count and
+    value.
+    """
+    facets = {
+        key: config
+        for key, config in facet_fields.items()
+        if config.get("type", "choice") in FACET_TYPES and config.get("field")
+    }
+    columns = {_column(key): F(config["field"]) for key, config in facets.items()}
+    base = queryset.order_by().values(_facet_pk=F("pk"), **columns)
+    base_sql, base_params = base.query.sql_with_params()
+
+    predicates = {
+        key: _predicate(facets[key], _column(key), [str(value) for value in values])
+        for key, values in (selected or {}).items()
+        if key in facets and values
+    }
+
+    def where(*conditions, exclude=None):
+        sql, params = list(conditions), []
+        for key, (predicate, predicate_params) in predicates.items():
+            if key != exclude:
+                sql.append(predicate)
+                params += predicate_params
+        return (f" WHERE {' AND '.join(sql)}" if sql else ""), params
+
+    total_where, params = where()
+    branches = [
+        f'SELECT NULL, NULL, COUNT(DISTINCT "_facet_pk") FROM base{total_where}'
+    ]
+    for key, config in facets.items():
+        column = _column(key)
+        if config.get("type", "choice") == "choice":
+            branch_where, branch_params = where(f'"{column}" IS NOT NULL', exclude=key)
+            branches.append(
+                f'SELECT %s, "{column}"::text, COUNT(DISTINCT "_facet_pk") '
+                f"FROM base{branch_where} GROUP BY 2"
+            )
+        else:
+            branch_where, branch_params = where(exclude=key)
+            branches.append(
+                f'SELECT %s, value::text, COUNT(DISTINCT "_facet_pk") '
+                f'FROM base CROSS JOIN LATERAL unnest("{column}") AS value'
+                f"{branch_where} GROUP BY 2"
+            )
+        params += [key, *branch_params]
+    sql = (
+        f"WITH base AS MATERIALIZED ({base_sql}) "
+        f"{' UNION ALL '.join(branches)} ORDER BY 3 DESC, 2"
+    )
+
+    total = 0
+    counts = {key: [] for key in facets}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, (*base_params, *params))
+        for key, value, count in cursor.fetchall():
+            if key is None:
+                total = count
+            else:
+                counts[key].append((value, count))
+    return total, counts
@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from datetime import date
+
+from apis_core.relations.models import Relation
+from django.core.cache import cache
+from django.db import connection
+
+from apis_ontology.models import (
+    HIERARCHY_RELATIONS,
+    LINEAGE,
+    DataVersion,
+    Institution,
+    InstitutionHierarchie,
+)
+from mine_frontend.cache import CACHE_TIMEOUT
+from mine_frontend.settings import AKADEMIE_INST_ROOT
+
+
+@dataclass(frozen=True)
+class HierarchyRow:
+    """an institution reached from the institution the lineage is built for
+
+    *rel* is the relation as seen from *via_id*, the institution the hop
+    starts at, and *depth* the number of hops; *up* is true for parents
+    and predecessors.
+    """
+
+    id: int
+    kind: str
+    up: bool
+    depth: int
+    via_id: int
+    rel: str
+    obj_id: int
+    obj_label: str | None
+    beginn_date_sort: date | None
+    ende_date_sort: date | None
+
+
+# hops followed from an institution, far more than the academy has levels
+LINEAGE_MAX_DEPTH = 30
+
+# Edges are oriented from the child (successor) `low` to the parent
+# (predecessor) `high`.  Structure edges touching a root of the academy and
+# lineage edges with such a root as object are left out, those are shown
+# as branches.  The walk follows each edge kind in one direction only over
+# the distinct links between two institutions, never revisits an
+# institution on its path and stops after `LINEAGE_MAX_DEPTH` hops; only
+# the shortest routes to an institution are returned, with a row for each
+# relation along their last hop.
+LINEAGE_SQL = """
+WITH RECURSIVE kinds(relation, kind, object_up) AS (
+    SELECT * FROM unnest(%(relations)s::text[], %(kinds)s::text[], %(ups)s::bool[])
+), roots AS (
+    SELECT rootobject_ptr_id AS id FROM {institution}
+    WHERE akademie_institution AND label = ANY(%(roots)s)
+), edge AS (
+    SELECT
+        r.id, k.kind, r.subj_object_id AS subj, r.obj_object_id AS obj,
+        h.relation, h.relation_reverse, h.beginn_date_sort, h.ende_date_sort,
+        CASE WHEN k.object_up THEN r.subj_object_id ELSE r.obj_object_id END AS low,
+        CASE WHEN k.object_up THEN r.obj_object_id ELSE r.subj_object_id END AS high
+    FROM {hierarchy} h
+    JOIN {relation} r ON r.id = h.relation_ptr_id
+    JOIN kinds k ON k.relation = h.relation
+    WHERE r.obj_object_id NOT IN (SELECT id FROM roots)
+    AND (k.kind = %(lineage)s OR r.subj_object_id NOT IN (SELECT id FROM roots))
+), link AS (
+    SELECT DISTINCT kind, low, high FROM edge WHERE low <> high
+), walk AS (
+    SELECT
+        l.kind, l.low = %(pk)s AS up, 1 AS depth, %(pk)s AS via_id,
+        CASE WHEN l.low = %(pk)s THEN l.high ELSE l.low END AS obj_id,
+        ARRAY[%(pk)s, CASE WHEN l.low = %(pk)s THEN l.high ELSE l.low END] AS path
+    FROM link l
+    WHERE %(pk)s IN (l.low, l.high)
+    UNION ALL
+    SELECT
+        l.kind, w.up, w.depth + 1, w.obj_id,
+        CASE WHEN w.up THEN l.high ELSE l.low END,
+        w.path || CASE WHEN w.up THEN l.high ELSE l.low END
+    FROM walk w
+    JOIN link l ON l.kind = w.kind
+    AND CASE WHEN w.up THEN l.low ELSE l.high END = w.obj_id
+    AND NOT (CASE WHEN w.up THEN l.high ELSE l.low END) = ANY(w.path)
+    WHERE w.depth < %(max_depth)s
+), shortest AS (
+    SELECT DISTINCT w.kind, w.up, w.depth, w.via_id, w.obj_id
+    FROM walk w
+    WHERE w.depth = (
+        SELECT min(x.depth) FROM walk x
+        WHERE x.kind = w.kind AND x.up = w.up AND x.obj_id = w.obj_id
+    )
+)
+SELECT DISTINCT
+    e.id, s.kind, s.up, s.depth, s.via_id,
+    CASE WHEN e.subj = s.via_id THEN e.relation ELSE e.relation_reverse END,
+    s.obj_id, i.label, e.beginn_date_sort, e.ende_date_sort
+FROM shortest s
+JOIN edge e ON e.kind = s.kind
+AND e.low = CASE WHEN s.up THEN s.via_id ELSE s.obj_id END
+AND e.high = CASE WHEN s.up THEN s.obj_id ELSE s.via_id END
+LEFT JOIN {institution} i ON i.rootobject_ptr_id = s.obj_id
+ORDER BY e.beginn_date_sort, s.depth, e.id
+"""
+
+
+def _lineage(pk):
+    sql = LINEAGE_SQL.format(
+        institution=Institution._meta.db_table,
+        hierarchy=InstitutionHierarchie._meta.db_table,
+        relation=Relation._meta.db_table,
+    )
+    params = {
+        "pk": pk,
+        "relations": list(HIERARCHY_RELATIONS),
+        "kinds": [kind for kind, _ in HIERARCHY_RELATIONS.values()],
+        "ups": [up for _, up in HIERARCHY_RELATIONS.values()],
+        "roots": AKADEMIE_INST_ROOT,
+        "lineage": LINEAGE,
+        "max_depth": LINEAGE_MAX_DEPTH,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [HierarchyRow(*row) for row in cursor.fetchall()]
+
+
+def institution_lineage(pk):
+    """all institutions connected to institution *pk* by hierarchy relations
+
+    The structure (parents and units) and the lineage (predecessors and
+    successors) are followed transitively in a single recursive query.
+    The rows are ordered by their begin date and cached until the data
+    changes.
+    """
+    version = DataVersion.objects.current(DataVersion.ONTOLOGY)
+    key = f"mine_frontend:hierarchy:{version}:{pk}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = _lineage(pk)
+        cache.set(key, rows, CACHE_TIMEOUT)
+    return rows
@@ -0,0 +1,201 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+from apis_core.uris.models import Uri
+from django.apps import apps
+from django.core.signals import request_started
+from django.db.models import prefetch_related_objects
+from django.utils.html import mark_safe
+
+from apis_ontology.models import DataVersion
+
+GND = "d-nb.info"
+ENTITY_CACHE_SIZE = 10000
+
+
+def internal_link(entity):
+    """link to the page of *entity* on this site, if it has one"""
+    if getattr(entity, "mitglied", False):
+        return mark_safe(f'<a href="/person/{entity.pk}">{entity}</a>')
+    if getattr(entity, "akademie_institution", False):
+        return mark_safe(f'<a href="/institution/{entity.pk}">{entity}</a>')
+    if getattr(entity, "academy_prize", False):
+        return mark_safe(f'<a href="/preis/{entity.pk}">{entity}</a>')
+    return None
+
+
+def gnd_link(entity, uri):
+    return mark_safe(
+        f'<a href="{uri}">{entity}</a><i data-feather="external-link" style="width: 1.1em; height: 1.1em; padding-left: 0.2em; vertical-align: middle;"></i>'
+    )
+
+
+def get_web_object_uri(uri_obj):
+    def get_identifier(uri_obj):
+        if "geschichtewiki" in uri_obj.uri:
+            return uri_obj.uri.split("=")[-1]
+        elif "parlament" in uri_obj.uri:
+            return re.search(r"PAD_(\d+)", uri_obj.uri).group(1)
+        elif "deutsche-biographie" in uri_obj.uri:
+            return re.search(r"/([0-9A-Z]+)\.html", uri_obj.uri).group(1)
+        else:
+            return uri_obj.uri.split("/")[-1]
+
+    return {
+        "uri": uri_obj.uri,
+        "kind": uri_obj.short_label,
+        "identifier": get_identifier(uri_obj),
+    }
+
+
+def gnd_uris(pks):
+    """the first GND URI of each of the entities *pks*, by primary key"""
+    uris = {}
+    for object_id, uri in (
+        Uri.objects.filter(uri__contains=GND, object_id__in=pks)
+        .order_by("pk")
+        .values_list("object_id", "uri")
+    ):
+        uris.setdefault(object_id, uri)
+    return uris
+
+
+def entity_link(entity):
+    """what `mine_link` renders for *entity*: a link, or the entity itself"""
+    link = getattr(entity, "_mine_link", None)
+    if link is not None:
+        return link
+    link = internal_link(entity)
+    if link is not None:
+        return link
+    gnd = Uri.objects.filter(uri__contains=GND, object_id=entity.pk).order_by("pk")
+    uri = gnd.values_list("uri", flat=True).first()
+    return gnd_link(entity, uri) if uri else entity
+
+
+def resolve_links(relations, fields=("subj", "obj")):
+    """Precompute the `mine_link` output for the *fields* of *relations*.
+
+    *relations* is an iterable of relations, e.g. a queryset that is then
+    evaluated here.  The entities are fetched in one query per model and
+    the GND URIs of those without a page of their own in one more query.
+    The result is kept on the entities, so the template filter does not
+    touch the database.
+    """
+    relations = list(relations)
+    if not relations:
+        return
+    prefetch_related_objects(relations, *fields)
+    entities = {}
+    for relation in relations:
+        for field in fields:
+            entity = getattr(relation, field)
+            if entity is not None:
+                entities[id(entity)] = entity
+    links = {key: internal_link(entity) for key, entity in entities.items()}
+    uris = gnd_uris({entities[key].pk for key, link in links.items() if link is None})
+    for key, entity in entities.items():
+        if links[key] is None and entity.pk in uris:
+            links[key] = gnd_link(entity, uris[entity.pk])
+        entity._mine_link = links[key] or entity
+
+
+@dataclass(frozen=True)
+class EntityRef:
+    """what `mine_link` and the facet labels need to know about an entity"""
+
+    pk: int
+    label: str
+    mitglied: bool = False
+    akademie_institution: bool = False
+    academy_prize: bool = False
+    gnd_uri: str | None = None
+
+    def __str__(self):
+        return self.label
+
+    @property
+    def link(self):
+        link = internal_link(self)
+        if link is None and self.gnd_uri:
+            link = gnd_link(self, self.gnd_uri)
+        return link or self.label
+
+
+class EntityCache:
+    """In-process LRU cache of `EntityRef`, keyed by model name and pk.
+
+    Holds at most *maxsize* entities.  The cache is emptied whenever the
+    `DataVersion.ONTOLOGY` counter changed, which is checked once per
+    request on the first lookup, so saves in other processes are seen too.
+    """
+
+    def __init__(self, maxsize=ENTITY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+        self.checked = False
+        self.lock = threading.Lock()
+
+    def expire(self, **kwargs):
+        """have the next lookup check the data version again"""
+        self.checked = False
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def _check_version(self):
+        if self.checked:
+            return
+        version = DataVersion.objects.current(DataVersion.ONTOLOGY)
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+            self.checked = True
+
+    def get_many(self, model_name, pks):
+        """the `EntityRef` of each existing entity in *pks*, by pk"""
+        self._check_version()
+        found, missing = {}, []
+        with self.lock:
+            for pk in pks:
+                key = (model_name, pk)
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[pk] = self.entries[key]
+                else:
+                    missing.append(pk)
+        if missing:
+            model = apps.get_model("apis_ontology", model_name)
+            refs = {
+                entity.pk: EntityRef(
+                    pk=entity.pk,
+                    label=str(entity),
+                    mitglied=bool(getattr(entity, "mitglied", False)),
+                    akademie_institution=bool(
+                        getattr(entity, "akademie_institution", False)
+                    ),
+                    academy_prize=bool(getattr(entity, "academy_prize", False)),
+                )
+                for entity in model.objects.filter(pk__in=missing)
+            }
+            uris = gnd_uris([pk for pk, ref in refs.items() if not internal_link(ref)])
+            with self.lock:
+                for pk, ref in refs.items():
+                    if pk in uris:
+                        ref = replace(ref, gnd_uri=uris[pk])
+                    found[pk] = self.entries[(model_name, pk)] = ref
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+        return found
+
+    def get(self, model_name, pk):
+        return self.get_many(model_name, [pk]).get(pk)
+
+
+entity_cache = EntityCache()
+request_started.connect(entity_cache.expire, dispatch_uid="mine_entity_cache")
@@ -0,0 +1,321 @@
+import datetime
+from collections import defaultdict
+
+from apis_core.relations.models import Relation
+from django.db.models import Case, OuterRef, Q, Value, When, prefetch_related_objects
+from django.utils.functional import SimpleLazyObject
+
+from apis_ontology.models import (
+    LINEAGE,
+    STRUCTURE,
+    AusbildungAn,
+    AutorVon,
+    Bild,
+    EhrentitelVonInstitution,
+    ErwaehntIn,
+    GeborenIn,
+    GestorbenIn,
+    Gewinnt,
+    HaeltRedeBei,
+    Institution,
+    InstitutionHierarchie,
+    Mitglied,
+    NichtGewaehlt,
+    OeawMitgliedschaft,
+    PositionAn,
+    Werk,
+    WirdVergebenVon,
+)
+from mine_frontend.hierarchy import institution_lineage
+from mine_frontend.links import resolve_links
+from mine_frontend.settings import AKADEMIE_INST_ROOT
+
+# relations with the member as subject, read in a single query
+MEMBER_RELATIONS = [
+    OeawMitgliedschaft,
+    NichtGewaehlt,
+    GeborenIn,
+    GestorbenIn,
+    AusbildungAn,
+    EhrentitelVonInstitution,
+    PositionAn,
+    Gewinnt,
+    Mitglied,
+    HaeltRedeBei,
+]
+
+# academy units whose presidium is listed separately
+PRESIDIUM_UNITS = [
+    "gesamtakademie",
+    "junge akademie",
+    "junge kurie",
+    "mathematisch-naturwissenschaftliche klasse",
+    "philosophisch-historische klasse",
+]
+PRESIDIUM = {
+    "pres": "Präsident(in)",
+    "viz_pres": "Vizepräsident(in)",
+    "sek": "Sekretär(in)",
+    "gen_sek": "Generalsekretär(in)",
+}
+# positions at academy institutions that are not listed as `pos_other_inst`
+NOT_OTHER_POSITIONS = [
+    *PRESIDIUM.values(),
+    "Kommissionsmitglied",
+    "Obmann/Obfrau (Kommission)",
+    "Delegierte(r)",
+]
+
+
+# the context of the detail views, see `lazy_context`
+MEMBER_DETAIL = [
+    "membership",
+    "membership_short",
+    "place_of_birth",
+    "place_of_death",
+    "education",
+    "honour_titles",
+    "prizes",
+    "career",
+    "career_akad",
+    "memb_akad",
+    "nazi",
+    "nekrologe_verfasst",
+    "own_nekro",
+    "speaches",
+    "image",
+]
+INSTITUTION_DETAIL = [
+    "branches",
+    "structure",
+    "predecessors",
+    "successors",
+    "leaders",
+    "deputies",
+    "members",
+]
+PRIZE_DETAIL = ["laureates", "awarded_by"]
+
+LEADERS = [
+    "Obmann/Obfrau (Kommission)",
+    "Direktor(in)",
+    "Direktor(in) (Institut/Forschungstelle)",
+    "Vorsitzende(r)",
+    "Institutsdirektor(in)",
+    "interimistischer Leiter",
+    "kommissarische(r) Leiter(in)",
+]
+DEPUTIES = [
+    "1. Stellvertreter(in)",
+    "2. Stellvertreter(in)",
+    "Obmann/Obfrau-Stellvertreter(in)",
+    "stv. Leiter(in)",
+    "stv. Direktor(in)",
+]
+MEMBERS = ["Kommissionsmitglied", "Delegierte(r)", "Mitglied"]
+
+
+def lazy_context(load, keys):
+    """the context *keys* of the dict returned by *load*, loaded on first use
+
+    *load* is called once, when a template first uses one of the values, so
+    pages whose fragments all come from the cache do not query the data.
+    """
+    data = SimpleLazyObject(load)
+    return {key: SimpleLazyObject(lambda key=key: data.get(key)) for key in keys}
+
+
+def by(*keys):
+    """sort key like ``ORDER BY`` in Postgres, which puts ``NULL`` last"""
+
+    def key(obj):
+        return [(value is None, value) for value in (k(obj) for k in keys)]
+
+    return key
+
+
+def sort_date(relation):
+    if relation.beginn_date_sort is not None:
+        return relation.beginn_date_sort
+    return relation.ende_date_sort
+
+
+def load_member_detail(person):
+    """the relations of *person* shown on its detail page
+
+    Returns the context of `OEAWMemberDetailView`, read in a fixed number of
+    queries: all relations with *person* as subject in one query, proposals
+    and obituaries in one query each, and the related entities and their
+    links via `resolve_links`.  The relations are partitioned and sorted in
+    Python.
+    """
+    relations = defaultdict(list)
+    for relation in (
+        Relation.objects.filter(subj_object_id=person.pk)
+        .select_subclasses(*MEMBER_RELATIONS)
+        .order_by("pk")
+    ):
+        if type(relation) in MEMBER_RELATIONS:
+            relations[type(relation)].append(relation)
+
+    proposed_success = list(
+        OeawMitgliedschaft.objects.filter(vorgeschlagen_von=person.pk).order_by(
+            "beginn_date_sort"
+        )
+    )
+    proposed_unsuccess = list(
+        NichtGewaehlt.objects.filter(vorgeschlagen_von=person.pk).order_by(
+            "datum_date_sort"
+        )
+    )
+    nekrolog = Werk.objects.filter(pk=OuterRef("obj_object_id"))
+    aut_nekro_pre = (
+        AutorVon.objects.filter(subj_object_id=person.pk)
+        .annotate(_title=nekrolog.values("titel"))
+        .values("obj_object_id")
+        .filter(_title__icontains="nekrolog")
+    )
+    nekrologe_verfasst = list(
+        ErwaehntIn.objects.filter(obj_object_id__in=aut_nekro_pre)
+    )
+    own_nekro = AutorVon.objects.filter(
+        obj_object_id__in=ErwaehntIn.objects.filter(subj_object_id=person.pk)
+        .annotate(_title=nekrolog.values("titel"))
+        .filter(_title__icontains="nekrolog")
+        .values("obj_object_id")
+    ).first()
+
+    prefetch_related_objects([person], "beruf")
+    prefetch_related_objects(relations[OeawMitgliedschaft], "vorgeschlagen_von")
+    prefetch_related_objects(relations[NichtGewaehlt], "vorgeschlagen_von")
+    prefetch_related_objects(relations[PositionAn], "fach")
+    prefetch_related_objects(relations[AusbildungAn], "fach")
+    shown = [*proposed_success, *proposed_unsuccess, *nekrologe_verfasst]
+    if own_nekro is not None:
+        shown.append(own_nekro)
+    resolve_links(
+        [relation for rows in relations.values() for relation in rows] + shown
+    )
+
+    memberships = relations[OeawMitgliedschaft]
+    context = {
+        "membership": sorted(
+            memberships + relations[NichtGewaehlt],
+            key=lambda obj: getattr(obj, "beginn_date_sort", None)
+            or getattr(obj, "datum_date_sort", None)
+            or datetime.date.today(),
+        ),
+        "membership_short": sorted(
+            (m for m in memberships if m.beginn_typ != "gewählt, nicht bestätigt"),
+            key=by(lambda m: m.beginn_date_sort),
+        ),
+        "place_of_birth": relations[GeborenIn],
+        "place_of_death": relations[GestorbenIn],
+        "education": sorted(
+            relations[AusbildungAn],
+            key=by(lambda a: a.typ != "Schule", lambda a: a.beginn_date_sort),
+        ),
+        "honour_titles": relations[EhrentitelVonInstitution],
+        "prizes": sorted(relations[Gewinnt], key=by(lambda g: g.datum_date_sort)),
+    }
+
+    positions = sorted(relations[PositionAn], key=by(sort_date))
+    akad = [p for p in positions if p.obj is not None and p.obj.akademie_institution]
+    context["career"] = [
+        p for p in positions if p.obj is not None and not p.obj.akademie_institution
+    ]
+    career_akad = {
+        key: [
+            p
+            for p in akad
+            if p.position == position and p.obj.label.lower() in PRESIDIUM_UNITS
+        ]
+        for key, position in PRESIDIUM.items()
+    }
+    career_akad["obm"] = [p for p in akad if p.position == "Obmann/Obfrau (Kommission)"]
+    career_akad["kom_mitgl"] = [p for p in akad if p.position == "Kommissionsmitglied"]
+    career_akad["pos_other_inst"] = [
+        p for p in akad if p.position not in NOT_OTHER_POSITIONS
+    ]
+    career_akad["proposed_success"] = proposed_success
+    career_akad["proposed_unsuccess"] = proposed_unsuccess
+    career_akad["delegations"] = [
+        p for p in positions if p.obj is not None and p.obj.typ == "Delegation"
+    ]
+    context["career_akad"] = career_akad if any(career_akad.values()) else False
+
+    member = sorted(relations[Mitglied], key=by(lambda m: m.beginn_date_sort))
+    context["memb_akad"] = [
+        m for m in member if m.obj is not None and m.obj.typ == "Akademie (Ausland)"
+    ]
+    context["nazi"] = [
+        m
+        for m in member
+        if m.obj is not None and "nationalsozialistisch" in m.obj.label.lower()
+    ]
+    context["nekrologe_verfasst"] = nekrologe_verfasst
+    if own_nekro is not None:
+        context["own_nekro"] = own_nekro
+    context["speaches"] = relations[HaeltRedeBei]
+    context["image"] = Bild.objects.filter(object_id=person.pk).order_by("art").first()
+    return context
+
+
+def load_institution_detail(institution):
+    """the relations of *institution* shown on its detail page"""
+    pk = institution.pk
+    ids_akad = Institution.objects.filter(
+        akademie_institution=True,
+        label__in=AKADEMIE_INST_ROOT,
+    ).values("id")
+    context = {}
+    context["branches"] = InstitutionHierarchie.objects.filter(
+        Q(
+            obj_object_id=pk,
+            relation="hat Untereinheit",
+            subj_object_id__in=ids_akad,
+        )
+        | Q(
+            subj_object_id=pk,
+            relation="ist Teil von",
+            obj_object_id__in=ids_akad,
+        )
+    ).annotate(
+        rel=Case(
+            When(subj_object_id=pk, then=Value("forward")),
+            default=Value("reverse"),
+        )
+    )
+
+    lineage = institution_lineage(pk)
+    context["structure"] = [row for row in lineage if row.kind == STRUCTURE]
+    context["predecessors"] = [row for row in lineage if row.kind == LINEAGE and row.up]
+    context["successors"] = [
+        row for row in lineage if row.kind == LINEAGE and not row.up
+    ]
+
+    positions = PositionAn.objects.filter(obj_object_id=pk).order_by("beginn_date_sort")
+    context["leaders"] = positions.filter(position__in=LEADERS)
+    context["deputies"] = positions.filter(position__in=DEPUTIES)
+    context["members"] = positions.filter(position__in=MEMBERS)
+    resolve_links(context["branches"])
+    resolve_links(
+        [*context["leaders"], *context["deputies"], *context["members"]],
+        fields=("subj",),
+    )
+    return context
+
+
+def load_prize_detail(prize):
+    """the laureates of *prize* and who awards it"""
+    context = {
+        "laureates": Gewinnt.objects.filter(obj_object_id=prize.pk).order_by(
+            "datum_date_sort"
+        ),
+        "awarded_by": WirdVergebenVon.objects.filter(subj_object_id=prize.pk).order_by(
+            "beginn_date_sort"
+        ),
+    }
+    resolve_links(context["laureates"], fields=("subj",))
+    resolve_links(context["awarded_by"], fields=("obj",))
+    return context
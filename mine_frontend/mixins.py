@@ -1,7 +1,14 @@
-from django.db.models import F, Func
-from django.db.models.aggregates import Count
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Value
+from django.db.models.functions import Greatest
 from django.db.models.query_utils import Q
 
+from apis_ontology.models import search_text
+
+from mine_frontend.cache import CountPaginator, get_or_compute
+from mine_frontend.facets import count_facets
+from mine_frontend.pagination import CURSOR_PARAM, KeysetPaginator
+
 
 class FacetedSearchMixin:
     """Mixin that provides faceted search and filtering for Django list views.
@@ -15,6 +22,8 @@ class FacetedSearchMixin:
                 'lookup': 'exact',           # optional, default 'exact'
                 'type': 'choice' | 'array',  # 'choice' = regular field,
                                              # 'array'  = ArraySubquery / ArrayField
+                'match': 'any' | 'all',      # optional, default 'any', only
+                                             # used by 'array' facets
             },
         }
 
@@ -23,6 +32,9 @@ class FacetedSearchMixin:
                 'label': 'Display Name',
                 'param': 'query_param',       # optional, defaults to key
                 'type': 'text' | 'choice' | 'array',
+                'match': 'any' | 'all',       # optional, see facet_fields
+                'rank': True,                 # optional, 'trigram' lookups
+                                              # only: order by similarity
 
                 # ---- lookups (AND-combined across fields) ----
                 'lookups': [
@@ -45,6 +57,12 @@ class FacetedSearchMixin:
 
     facet_fields = {}
     filter_fields = {}
+    # annotations only needed to display a row; evaluated for the visible page
+    page_annotations = {}
+    # page through the table with `mine_frontend.pagination.KeysetPaginator`
+    keyset_pagination = False
+    # optional `mine_frontend.bitsets.BitsetFacetBackend`
+    facet_backend = None
 
     def get_facet_fields(self):
         return getattr(self, "facet_fields", {})
@@ -53,24 +71,39 @@ class FacetedSearchMixin:
         return getattr(self, "filter_fields", {})
 
     def get_base_queryset(self):
-        """Override to provide the base queryset before any filtering."""
+        """Override to provide the base queryset before any filtering.
+
+        Values used by filters, facets and sorting should be added with
+        ``alias()`` so that they are only evaluated when actually referenced.
+        """
         return self.get_queryset()
 
     @staticmethod
-    def _build_q(field, lookup, values):
+    def _build_q(field, lookup, values, match="any"):
         """Return a Q object for *field* / *lookup* / *values*.
 
-        Handles the special cases ``array`` (``__contains``), ``in``,
-        and the generic ``field__lookup`` pattern.  Multiple values are
-        always OR-combined.
+        Handles the special cases ``array``, ``in``, ``trigram`` and the
+        generic ``field__lookup`` pattern.  Multiple values are OR-combined,
+        except for ``array`` with ``match="all"``.
+
+        ``array`` emits a single ``__overlap`` (any of *values*) or
+        ``__contains`` (all of *values*) predicate, both of which can be
+        answered by a GIN index on the array column.
+
+        ``trigram`` expects *field* to be a `search_text` alias and matches
+        the likewise normalized values as substrings, which a ``gin_trgm_ops``
+        index on the same expression can answer.
         """
         if lookup == "array":
+            array_lookup = "contains" if match == "all" else "overlap"
+            return Q(**{f"{field}__{array_lookup}": values})
+        if lookup == "in":
+            return Q(**{f"{field}__in": values})
+        if lookup == "trigram":
             q = Q()
             for v in values:
-                q |= Q(**{f"{field}__contains": [v]})
+                q |= Q(**{f"{field}__contains": search_text(Value(v))})
             return q
-        if lookup == "in":
-            return Q(**{f"{field}__in": values})
         if lookup == "bool":
             q = Q()
             for v in values:
@@ -103,8 +136,33 @@ class FacetedSearchMixin:
         query = Q()
         for lookup_val, field_to_filter in lookups:
             effective = "array" if field_type == "array" else lookup_val
-            query &= cls._build_q(field_to_filter, effective, values)
-        return queryset.filter(query)
+            query &= cls._build_q(
+                field_to_filter, effective, values, config.get("match", "any")
+            )
+        queryset = queryset.filter(query)
+        if config.get("rank"):
+            queryset = cls._rank(queryset, lookups, values)
+        return queryset
+
+    @staticmethod
+    def _rank(queryset, lookups, values):
+        """Order *queryset* by the best trigram similarity of *values*.
+
+        The similarity is computed in the same query as the filter; the
+        previous ordering is kept as tiebreaker.  An explicit table sort
+        replaces this order.
+        """
+        similarities = [
+            TrigramWordSimilarity(search_text(Value(v)), field)
+            for lookup, field in lookups
+            if lookup == "trigram"
+            for v in values
+        ]
+        if not similarities:
+            return queryset
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        return queryset.alias(search_rank=rank).order_by("-search_rank", *ordering)
 
     def _get_selected(self, param):
         """Return non-empty selected values for a query parameter."""
@@ -136,7 +194,7 @@ class FacetedSearchMixin:
         return self._apply_filter_set(queryset, self.get_filter_fields())
 
     def apply_facet_filters_except(self, queryset, exclude_facet=None):
-        """Apply all facet filters except *exclude_facet*."""  # FIXME: dont know anymore why exclude_facet is an option
+        """Apply all facet filters except *exclude_facet*."""
         return self._apply_filter_set(
             queryset, self.get_facet_fields(), exclude=exclude_facet
         )
@@ -145,68 +203,71 @@ class FacetedSearchMixin:
         queryset = self.apply_non_facet_filters(queryset)
         return self.apply_facet_filters_except(queryset, exclude_facet)
 
+    def get_selected_facets(self):
+        """Return the selected values of every facet, keyed by facet."""
+        return {key: self._get_selected(key) for key in self.get_facet_fields()}
+
     def get_facet_counts(self, base_queryset=None):
-        """Calculate facet counts for all defined facets."""
+        """Calculate facet counts for all defined facets.
+
+        The counts of each facet honour every filter except the facet's own
+        selection, so selected facets keep listing their alternatives.  All
+        counts are computed in a single query, see
+        :func:`mine_frontend.facets.count_facets`.
+        """
         if base_queryset is None:
             base_queryset = self.get_base_queryset()
 
-        filtered_qs = self.apply_non_facet_filters(base_queryset)
+        counts = get_or_compute(
+            "facets", self, lambda: self._count_facets(base_queryset)
+        )
         facets = {}
 
         for key, config in self.get_facet_fields().items():
-            selected = self._get_selected(key)
-            field = config["field"]
-            temp_qs = self.apply_facet_filters_except(filtered_qs)
-            if selected:
-                facets[key] = {
-                    "label": config["label"],
-                    "field_name": field,
-                    "values": [
-                        {field + "_unnested": selected[0], "count": temp_qs.count()},
-                    ],
-                    "selected": selected,
-                }
+            if key not in counts:
                 continue
+            field = config["field"]
             ftype = config.get("type", "choice")
-
-            value_counts = None
-
-            if ftype == "choice":
-                value_counts = (
-                    temp_qs.values(field)
-                    .annotate(count=Count("id", distinct=True))
-                    .filter(**{f"{field}__isnull": False})
-                    .order_by("-count", field)
-                )
-            elif ftype == "array":
-                field_to_unnest = field
-                unnested_alias = f"{field_to_unnest}_unnested"
-
-                if not field_to_unnest:
-                    continue
-
-                value_counts = (
-                    temp_qs.annotate(
-                        **{unnested_alias: Func(F(field_to_unnest), function="unnest")}
-                    )
-                    .values(unnested_alias)
-                    .annotate(count=Count("id"))
-                    .values(unnested_alias, "count")
-                    .order_by("-count", unnested_alias)
-                )
-            else:
-                continue
-
-            if value_counts is not None:
-                facets[key] = {
-                    "label": config["label"],
-                    "field_name": field,
-                    "values": value_counts,
-                    "selected": selected,
-                }
+            value_key = field if ftype == "choice" else f"{field}_unnested"
+            facets[key] = {
+                "label": config["label"],
+                "field_name": field,
+                "values": [
+                    {value_key: value, "count": count} for value, count in counts[key]
+                ],
+                "selected": self._get_selected(key),
+            }
 
         return facets
 
+    def _count_facets(self, base_queryset):
+        backend = self.facet_backend
+        if backend is not None and backend.enabled:
+            _, counts = self._count_facets_in_memory(backend, base_queryset)
+        else:
+            _, counts = count_facets(
+                self.apply_non_facet_filters(base_queryset),
+                self.get_facet_fields(),
+                self.get_selected_facets(),
+            )
+        return counts
+
+    def _count_facets_in_memory(self, backend, base_queryset):
+        """Count facets with the bitsets of *backend*.
+
+        Only the non-facet filters still hit the database, and only if one
+        of them is active.
+        """
+        index = backend.get_index(self)
+        mask = index.all
+        if any(
+            self._get_selected(config.get("param", key))
+            for key, config in self.get_filter_fields().items()
+        ):
+            filtered_qs = self.apply_non_facet_filters(base_queryset)
+            mask = index.mask(filtered_qs.order_by().values_list("pk", flat=True))
+        return index.count(mask, self.get_selected_facets())
+
     def get_filters(self):
         """Return a list of dicts describing the currently active filters."""
         result = []
@@ -226,6 +287,40 @@ class FacetedSearchMixin:
             result.append(entry)
         return result
 
+    def get_table_pagination(self, table):
+        """Paginate with the number of results taken from the cache."""
+        paginate = super().get_table_pagination(table)
+        if paginate is False:
+            return paginate
+        if paginate is True:
+            paginate = {}
+        paginate["paginator_class"] = CountPaginator
+        if self.keyset_pagination:
+            paginate["paginator_class"] = KeysetPaginator
+            paginate["cursor"] = self.request.GET.get(CURSOR_PARAM)
+        paginate["count"] = get_or_compute(
+            "count", self, lambda: table.data.data.count()
+        )
+        return paginate
+
+    def get_table(self, **kwargs):
+        """Load the rows of the visible page in a second, narrow query.
+
+        The filtered and sorted queryset only yields the primary keys of the
+        current page; the records themselves, with `page_annotations`, are
+        then fetched for those keys alone.
+        """
+        table = super().get_table(**kwargs)
+        page = getattr(table, "page", None)
+        if not self.page_annotations or page is None:
+            return table
+        pks = list(page.object_list.data.values_list("pk", flat=True))
+        records = table.data.data.model._default_manager.annotate(
+            **self.page_annotations
+        ).in_bulk(pks)
+        page.object_list.data = [records[pk] for pk in pks if pk in records]
+        return table
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         base_qs = self.get_base_queryset()
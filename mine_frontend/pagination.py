@@ -0,0 +1,152 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django_tables2.rows import BoundRows
+
+from mine_frontend.cache import CountPaginator
+
+CURSOR_PARAM = "cursor"
+NOTHING = Q(pk__in=[])
+
+
+def _reverse(keys):
+    return [key[1:] if key.startswith("-") else f"-{key}" for key in keys]
+
+
+def _beyond(field, value, descending):
+    """rows strictly after *value* of *field*
+
+    Uses the Postgres defaults NULLS LAST for ascending and NULLS FIRST for
+    descending order.
+    """
+    if descending:
+        if value is None:
+            return Q(**{f"{field}__isnull": False})
+        return Q(**{f"{field}__lt": value})
+    if value is None:
+        return NOTHING
+    return Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+
+
+def seek(keys, values):
+    """Q for the rows following the row with *values* in the order *keys*"""
+    q, equal = Q(), Q()
+    for key, value in zip(keys, values):
+        field = key.lstrip("-")
+        q |= equal & _beyond(field, value, key.startswith("-"))
+        if value is None:
+            equal &= Q(**{f"{field}__isnull": True})
+        else:
+            equal &= Q(**{field: value})
+    return q
+
+
+def encode_cursor(direction, number, keys, values):
+    data = json.dumps([direction, number, keys, values], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    direction, number, keys, values = json.loads(base64.urlsafe_b64decode(cursor))
+    return direction, number, keys, values
+
+
+class KeysetPage(Page):
+    """page that knows the cursors of its neighbours"""
+
+    def _cursor(self, direction, number, record):
+        keys = self.paginator.keys
+        if not keys or any("__" in key for key in keys):
+            return ""
+        missing = object()
+        values = [getattr(record, key.lstrip("-"), missing) for key in keys]
+        if any(value is missing for value in values):
+            # ordered by an alias, e.g. a search rank, that is not on the row
+            return ""
+        if any(isinstance(value, list) for value in values):
+            # array columns cannot be compared with a typeless parameter
+            return ""
+        return encode_cursor(direction, number, keys, values)
+
+    @property
+    def next_cursor(self):
+        records = list(self.object_list.data)
+        if not self.has_next() or not records:
+            return ""
+        return self._cursor("after", self.next_page_number(), records[-1])
+
+    @property
+    def previous_cursor(self):
+        records = list(self.object_list.data)
+        if not self.has_previous() or not records:
+            return ""
+        return self._cursor("before", self.previous_page_number(), records[0])
+
+
+class KeysetPaginator(CountPaginator):
+    """Paginator for table querysets that seeks instead of using OFFSET.
+
+    The order of the queryset gets the primary key as tiebreaker.  Pages
+    reached through a *cursor* of a neighbouring page, see `KeysetPage`,
+    are fetched with a ``WHERE`` on the sort keys; all other pages (and
+    invalid cursors) fall back to ``OFFSET``.
+    """
+
+    def __init__(self, object_list, per_page, cursor=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cursor = cursor
+        self.keys = None
+        data = object_list.data
+        queryset = data.data
+        keys = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if all(isinstance(key, str) and key != "?" for key in keys):
+            if not {"pk", "-pk"} & set(keys):
+                keys.append("pk")
+            self.keys = keys
+            data.data = queryset.order_by(*keys)
+
+    def _get_page(self, *args, **kwargs):
+        return KeysetPage(*args, **kwargs)
+
+    def _seek(self, number):
+        """the rows of page *number* via the cursor, or None"""
+        if not self.cursor or not self.keys:
+            return None
+        try:
+            direction, cursor_number, keys, values = decode_cursor(self.cursor)
+            if cursor_number != number or keys != self.keys:
+                return None
+            if direction not in ("after", "before"):
+                return None
+            queryset = self.object_list.data.data
+            bottom = (number - 1) * self.per_page
+            top = bottom + self.per_page
+            if top + self.orphans >= self.count:
+                top = self.count
+            if direction == "after":
+                return queryset.filter(seek(keys, values))[: top - bottom]
+            before = (
+                queryset.order_by(*_reverse(keys))
+                .filter(seek(_reverse(keys), values))
+                .values("pk")[: top - bottom]
+            )
+            return queryset.filter(pk__in=before)
+        except (ValueError, TypeError, ValidationError, binascii.Error):
+            return None
+
+    def page(self, number):
+        number = self.validate_number(number)
+        rows = self._seek(number)
+        if rows is None:
+            return super().page(number)
+        object_list = BoundRows(
+            data=rows,
+            table=self.object_list.table,
+            pinned_data=self.object_list.pinned_data,
+        )
+        return self._get_page(object_list, number, self)
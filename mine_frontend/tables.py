@@ -55,6 +55,7 @@ class SearchResultTable(tables.Table):
         )
         attrs = {"class": "table table-hover custom-table bg-mine", "thead": {}}
         empty_text = "Keine Ergebnisse"
+        template_name = "mine_frontend/keyset_table.html"
 
 
 class SearchResultInstitutionTable(tables.Table):
@@ -99,3 +100,4 @@ class SearchResultInstitutionTable(tables.Table):
         # template_name = "mine_frontend/custom_results_table.html"
         # row_attrs = {"data-member": lambda record: record.academy_member}
         empty_text = "Keine Ergebnisse"
+        template_name = "mine_frontend/keyset_table.html"
@@ -1,5 +1,6 @@
 from django import template
-from django.contrib.contenttypes.models import ContentType
+
+from mine_frontend.links import entity_cache
 
 register = template.Library()
 
@@ -27,8 +28,11 @@ def facet_url(request, facet_key, value, action="add"):
 @register.simple_tag
 def get_facet_label(filter, value):
     if "model_resolve" in filter:
-        cls = ContentType.objects.get(model=filter["model_resolve"]).model_class()
-        return str(cls.objects.get(pk=value))
+        try:
+            entity = entity_cache.get(filter["model_resolve"], int(value))
+        except ValueError:
+            entity = None
+        return str(entity) if entity is not None else value
     elif value == "true" or value == "on":
         return "ausgewählt"
     else:
@@ -1,7 +1,6 @@
-from apis_core.uris.models import Uri
 from django import template
-from django.contrib.contenttypes.models import ContentType
-from django.utils.html import mark_safe
+
+from mine_frontend.links import entity_cache, entity_link
 
 register = template.Library()
 
@@ -9,22 +8,9 @@ register = template.Library()
 @register.filter()
 def mine_link(value, entity_type: str = "person"):
     if isinstance(value, int):
-        cls = ContentType.objects.get(model=entity_type).model_class()
-        value = cls.objects.get(pk=value)
-    if hasattr(value, "mitglied"):
-        if value.mitglied:
-            return mark_safe(f'<a href="/person/{value.pk}">{value}</a>')
-    if hasattr(value, "akademie_institution"):
-        if value.akademie_institution:
-            return mark_safe(f'<a href="/institution/{value.pk}">{value}</a>')
-    if hasattr(value, "academy_prize") and value.academy_prize:
-        return mark_safe(f'<a href="/preis/{value.pk}">{value}</a>')
-    gnd = Uri.objects.filter(uri__contains="d-nb.info", object_id=value.pk)
-    if gnd.exists():
-        return mark_safe(
-            f'<a href="{gnd.first().uri}">{value}</a><i data-feather="external-link" style="width: 1.1em; height: 1.1em; padding-left: 0.2em; vertical-align: middle;"></i>'
-        )
-    return value
+        entity = entity_cache.get(entity_type, value)
+        return entity.link if entity is not None else value
+    return entity_link(value)
 
 
 @register.simple_tag
@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apis_ontology.models import (
+    AusbildungAn,
+    GeborenIn,
+    Gewinnt,
+    Institution,
+    OeawMitgliedschaft,
+    Ort,
+    Person,
+    PersonDossier,
+    PositionAn,
+    Preis,
+)
+from mine_frontend.dossier import refresh_dossiers
+from mine_frontend.links import entity_cache
+
+
+def relate(model, subj, obj, **kwargs):
+    return model.objects.create(
+        subj_content_type=ContentType.objects.get_for_model(subj),
+        subj_object_id=subj.pk,
+        obj_content_type=ContentType.objects.get_for_model(obj),
+        obj_object_id=obj.pk,
+        **kwargs,
+    )
+
+
+def create_member(forename, surname, klasse, universities, memberships):
+    """a member with an education and a position at each of *universities*"""
+    member = Person.objects.create(forename=forename, surname=surname, mitglied=True)
+    for mitgliedschaft in memberships:
+        relate(OeawMitgliedschaft, member, klasse, mitgliedschaft=mitgliedschaft)
+    relate(GeborenIn, member, Ort.objects.create(label=f"Geburtsort {surname}"))
+    for label in universities:
+        university = Institution.objects.create(label=label, typ="Universität")
+        relate(AusbildungAn, member, university, typ="Studium")
+        relate(PositionAn, member, university, position="Professor(in)")
+    relate(Gewinnt, member, Preis.objects.create(name=f"Preis {surname}"))
+    return member
+
+
+class MemberDetailQueriesTest(TestCase):
+    """the detail page of a member is read in a fixed number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("reader")
+        klasse = Institution.objects.create(
+            label="MATHEMATISCH-NATURWISSENSCHAFTLICHE KLASSE",
+            akademie_institution=True,
+            typ="Klasse",
+        )
+        cls.member = create_member(
+            "Lise",
+            "Meitner",
+            klasse,
+            ["Universität Wien", "Universität Berlin"],
+            ["kM I"],
+        )
+        cls.busy_member = create_member(
+            "Erwin",
+            "Schrödinger",
+            klasse,
+            [f"Universität {i}" for i in range(12)],
+            ["kM I", "wM", "EM"],
+        )
+
+    def setUp(self):
+        caches["template_fragments"].clear()
+        entity_cache.clear()
+        self.client.force_login(self.user)
+
+    def page_queries(self, member):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/person/{member.pk}/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count(self):
+        response, few = self.page_queries(self.member)
+        self.assertContains(response, "Universität Berlin")
+        response, many = self.page_queries(self.busy_member)
+        self.assertContains(response, "Universität 11")
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 18)
+
+    def test_dossier(self):
+        url = f"/person/{self.member.pk}/dossier/"
+        live = self.client.get(url).json()
+        self.assertEqual(live["person"]["label"], str(self.member))
+        PersonDossier.objects.create(person=self.member, data={"stored": True})
+        self.assertEqual(self.client.get(url).json(), {"stored": True})
+        PersonDossier.objects.update(stale=True)
+        self.assertEqual(self.client.get(url).json(), live)
+
+    def test_refresh_dossiers(self):
+        self.assertEqual(refresh_dossiers([self.member.pk]), 1)
+        dossier = PersonDossier.objects.get(person=self.member)
+        self.assertFalse(dossier.stale)
+        self.assertEqual(dossier.data["person"]["label"], str(self.member))
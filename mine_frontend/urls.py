@@ -12,11 +12,13 @@ from mine_frontend.autocompletes import (
     WissenschaftsaustauschDal,
 )
 from mine_frontend.views import (
+    CacheStatsView,
     IndexView,
     InstitutionIndexView,
     InstitutionResultsView,
     OEAWInstitutionDetailView,
     OEAWMemberDetailView,
+    OEAWMemberDossierView,
     OEAWPrizeDetailView,
     PersonResultsView,
 )
@@ -30,6 +32,11 @@ urlpatterns = [
         name="about",
     ),
     path("person/<int:pk>/", OEAWMemberDetailView.as_view(), name="person-detail"),
+    path(
+        "person/<int:pk>/dossier/",
+        OEAWMemberDossierView.as_view(),
+        name="person-dossier",
+    ),
     path(
         "institution/<int:pk>/",
         OEAWInstitutionDetailView.as_view(),
@@ -46,6 +53,7 @@ urlpatterns = [
         InstitutionResultsView.as_view(),
         name="institution-search",
     ),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
     path("ac/vorgeschlagende", VorschlagendeDal.as_view(), name="dal-vorschlagende"),
     path("ac/institute", OEAWInstitutionsDal.as_view(), name="dal-institute"),
     path("ac/geburtsort", GeburtsorteDal.as_view(), name="dal-geburtsort"),
@@ -1,7 +1,11 @@
 import os
+from functools import lru_cache
 
 from imgproxy import ImgProxy
 
+# signed URLs kept by `signed_url`, one per image and operation
+SIGNED_URL_CACHE_SIZE = 10000
+
 
 class MyImgProxy:
     def __init__(self, *args, **kwargs):
@@ -23,3 +27,17 @@ class MyImgProxy:
 
     def resize(self, path, width=150, height=200):
         return self.img_url(path)(width=width, height=height, resizing_type="fit")
+
+
+# the keys are read once, when the process starts
+signer = MyImgProxy()
+
+
+@lru_cache(maxsize=SIGNED_URL_CACHE_SIZE)
+def signed_url(path, operation="calc", width=None, height=None):
+    """the URL of *path* as returned by the *operation* of `signer`, memoized
+
+    *width* and *height* are passed on to ``resize`` and ``crop``.
+    """
+    sizes = [size for size in (width, height) if size is not None]
+    return getattr(signer, operation)(path, *sizes)
@@ -1,37 +1,28 @@
 import datetime
-import re
 
 from apis_core.uris.models import Uri
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.postgres.expressions import ArraySubquery
-from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
-from django.db.models.functions import Concat, Lower
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F, OuterRef, Subquery
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.views import generic
 from django.views.generic.base import TemplateView
 from django_tables2.views import SingleTableView
 
 from apis_ontology.models import (
-    AusbildungAn,
-    AutorVon,
-    Bild,
-    EhrentitelVonInstitution,
-    ErwaehntIn,
-    GeborenIn,
-    GestorbenIn,
-    Gewinnt,
-    HaeltRedeBei,
     Institution,
-    InstitutionHierarchie,
-    Mitglied,
-    NichtGewaehlt,
-    OeawMitgliedschaft,
+    InstitutionClosure,
     Person,
-    PositionAn,
     Preis,
-    Werk,
-    WirdVergebenVon,
-    WissenschaftsaustauschIn,
 )
+from apis_ontology.name_variants import search_names
+from apis_ontology.search_index import INDEX_FIELDS, SEARCH_INDEX_VERSION
+from mine_frontend.bitsets import BitsetFacetBackend
+from mine_frontend.cache import cache_response, cache_stats, fragment_cache_context
+from mine_frontend.dossier import get_dossier
 from mine_frontend.filters import (
     beruf_institution,
     life_ending,
@@ -41,29 +32,20 @@ from mine_frontend.filters import (
     wahlvorschlag,
 )
 from mine_frontend.forms import InstitutionMainForm, MineMainform
+from mine_frontend.links import get_web_object_uri
+from mine_frontend.loaders import (
+    INSTITUTION_DETAIL,
+    MEMBER_DETAIL,
+    PRIZE_DETAIL,
+    lazy_context,
+    load_institution_detail,
+    load_member_detail,
+    load_prize_detail,
+)
 from mine_frontend.mixins import FacetedSearchMixin
-from mine_frontend.settings import AKADEMIE_INST_ROOT, POSITIONEN_PRES
 from mine_frontend.tables import SearchResultInstitutionTable, SearchResultTable
 
 
-def get_web_object_uri(uri_obj):
-    def get_identifier(uri_obj):
-        if "geschichtewiki" in uri_obj.uri:
-            return uri_obj.uri.split("=")[-1]
-        elif "parlament" in uri_obj.uri:
-            return re.search(r"PAD_(\d+)", uri_obj.uri).group(1)
-        elif "deutsche-biographie" in uri_obj.uri:
-            return re.search(r"/([0-9A-Z]+)\.html", uri_obj.uri).group(1)
-        else:
-            return uri_obj.uri.split("/")[-1]
-
-    return {
-        "uri": uri_obj.uri,
-        "kind": uri_obj.short_label,
-        "identifier": get_identifier(uri_obj),
-    }
-
-
 class OEAWMemberDetailView(LoginRequiredMixin, generic.DetailView):
     model = Person
     queryset = Person.objects.filter(mitglied=True)
@@ -72,189 +54,30 @@ class OEAWMemberDetailView(LoginRequiredMixin, generic.DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        membership_list = list(
-            OeawMitgliedschaft.objects.filter(subj_object_id=self.object.id)
-        ) + list(NichtGewaehlt.objects.filter(subj_object_id=self.object.id))
-        context["membership"] = sorted(
-            membership_list,
-            key=lambda obj: getattr(obj, "beginn_date_sort", None)
-            or getattr(obj, "datum_date_sort", None)
-            or datetime.date.today(),
-        )
-        context["membership_short"] = (
-            OeawMitgliedschaft.objects.filter(subj_object_id=self.object.id)
-            .exclude(beginn_typ="gewählt, nicht bestätigt")
-            .order_by("beginn_date_sort")
-        )
-        context["place_of_birth"] = GeborenIn.objects.filter(
-            subj_object_id=self.object.id
-        )
-        context["place_of_death"] = GestorbenIn.objects.filter(
-            subj_object_id=self.object.id
-        )
-        context["education"] = AusbildungAn.objects.filter(
-            subj_object_id=self.object.id
-        ).order_by(
-            Case(When(typ="Schule", then=Value(0)), default=Value(1)),
-            "beginn_date_sort",
-        )
-        context["honour_titles"] = EhrentitelVonInstitution.objects.filter(
-            subj_object_id=self.object.id
-        )
-        inst_akad = Institution.objects.filter(pk=OuterRef("obj_object_id"))
-        career = (
-            PositionAn.objects.filter(subj_object_id=self.object.id)
-            .annotate(
-                _inst_akad=inst_akad.values("akademie_institution"),
-                _inst_typ=inst_akad.values("typ"),
-                _inst_name=Lower(inst_akad.values("label")),
-                _sort_date=Case(
-                    When(beginn_date_sort__isnull=False, then="beginn_date_sort"),
-                    default="ende_date_sort",
-                ),
-            )
-            .order_by("_sort_date")
-        )
-        context["career"] = career.exclude(_inst_akad=True)
-        context["career_akad"] = {}
-
-        pres = career.exclude(_inst_akad=False).filter(
-            position="Präsident(in)",
-            _inst_name__in=[
-                "gesamtakademie",
-                "junge akademie",
-                "junge kurie",
-                "mathematisch-naturwissenschaftliche klasse",
-                "philosophisch-historische klasse",
-            ],
-        )
-        viz_pres = career.exclude(_inst_akad=False).filter(
-            position="Vizepräsident(in)",
-            _inst_name__in=[
-                "gesamtakademie",
-                "junge akademie",
-                "junge kurie",
-                "mathematisch-naturwissenschaftliche klasse",
-                "philosophisch-historische klasse",
-            ],
-        )
-        sek = career.exclude(_inst_akad=False).filter(
-            position="Sekretär(in)",
-            _inst_name__in=[
-                "gesamtakademie",
-                "junge akademie",
-                "junge kurie",
-                "mathematisch-naturwissenschaftliche klasse",
-                "philosophisch-historische klasse",
-            ],
-        )
-        gen_sek = career.exclude(_inst_akad=False).filter(
-            position="Generalsekretär(in)",
-            _inst_name__in=[
-                "gesamtakademie",
-                "junge akademie",
-                "junge kurie",
-                "mathematisch-naturwissenschaftliche klasse",
-                "philosophisch-historische klasse",
-            ],
+        context.update(
+            lazy_context(lambda: load_member_detail(self.object), MEMBER_DETAIL)
         )
-        obm = career.exclude(_inst_akad=False).filter(
-            position="Obmann/Obfrau (Kommission)"
-        )
-        kom_mitgl = career.exclude(_inst_akad=False).filter(
-            position="Kommissionsmitglied"
-        )
-        pos_other_inst = (
-            career.exclude(_inst_akad=False)
-            .exclude(position="Sekretär(in)")
-            .exclude(position="Präsident(in)")
-            .exclude(position="Vizepräsident(in)")
-            .exclude(position="Kommissionsmitglied")
-            .exclude(position="Obmann/Obfrau (Kommission)")
-            .exclude(position="Delegierte(r)")
-            .exclude(position="Generalsekretär(in)")
-        )
-        proposed_success = OeawMitgliedschaft.objects.filter(
-            vorgeschlagen_von=self.object.id
-        ).order_by("beginn_date_sort")
-        proposed_unsuccess = NichtGewaehlt.objects.filter(
-            vorgeschlagen_von=self.object.id
-        ).order_by("datum_date_sort")
-        delegations = career.filter(_inst_typ="Delegation")
-
-        if any(
-            qs.exists()
-            for qs in [
-                pres,
-                viz_pres,
-                sek,
-                gen_sek,
-                obm,
-                kom_mitgl,
-                proposed_success,
-                proposed_unsuccess,
-                delegations,
-                pos_other_inst,
+        context["reference_resources"] = SimpleLazyObject(
+            lambda: [
+                get_web_object_uri(x)
+                for x in Uri.objects.filter(object_id=self.object.id)
             ]
-        ):
-            context["career_akad"] = {
-                "pres": pres,
-                "viz_pres": viz_pres,
-                "sek": sek,
-                "gen_sek": gen_sek,
-                "obm": obm,
-                "kom_mitgl": kom_mitgl,
-                "pos_other_inst": pos_other_inst,
-                "proposed_success": proposed_success,
-                "proposed_unsuccess": proposed_unsuccess,
-                "delegations": delegations,
-            }
-        else:
-            context["career_akad"] = False
-        context["image"] = (
-            Bild.objects.filter(object_id=self.object.id).order_by("art").first()
-        )
-        context["reference_resources"] = [
-            get_web_object_uri(x) for x in Uri.objects.filter(object_id=self.object.id)
-        ]
-        context["prizes"] = Gewinnt.objects.filter(
-            subj_object_id=self.object.id
-        ).order_by("datum_date_sort")
-        inst_member = Institution.objects.filter(pk=OuterRef("obj_object_id"))
-        member = (
-            Mitglied.objects.filter(subj_object_id=self.object.id)
-            .annotate(
-                _inst_kind=inst_member.values("typ"),
-                _inst_label=inst_member.values("label"),
-            )
-            .order_by("beginn_date_sort")
         )
-        context["memb_akad"] = member.filter(_inst_kind="Akademie (Ausland)")
-        context["nazi"] = member.filter(_inst_label__icontains="nationalsozialistisch")
-        nekrolog = Werk.objects.filter(pk=OuterRef("obj_object_id"))
-        aut_nekro_pre = (
-            AutorVon.objects.filter(subj_object_id=self.object.id)
-            .annotate(_title=nekrolog.values("titel"))
-            .values("obj_object_id")
-            .filter(_title__icontains="nekrolog")
-        )
-        context["nekrologe_verfasst"] = ErwaehntIn.objects.filter(
-            obj_object_id__in=aut_nekro_pre
-        )
-        own_nekro_pre = AutorVon.objects.filter(
-            obj_object_id__in=ErwaehntIn.objects.filter(subj_object_id=self.object.id)
-            .annotate(_title=nekrolog.values("titel"))
-            .filter(_title__icontains="nekrolog")
-            .values("obj_object_id")
-        )
-        if own_nekro_pre.exists():
-            context["own_nekro"] = own_nekro_pre.first()
-        context["speaches"] = HaeltRedeBei.objects.filter(subj_object_id=self.object.id)
         context["entity_type"] = "person"
+        context.update(fragment_cache_context(self.object))
 
         return context
 
 
+class OEAWMemberDossierView(LoginRequiredMixin, generic.DetailView):
+    """the data of the detail page of a member as JSON, see `get_dossier`"""
+
+    queryset = Person.objects.filter(mitglied=True)
+
+    def render_to_response(self, context, **response_kwargs):
+        return JsonResponse(get_dossier(self.object), **response_kwargs)
+
+
 class OEAWInstitutionDetailView(LoginRequiredMixin, generic.DetailView):
     model = Institution
     queryset = Institution.objects.filter(akademie_institution=True)
@@ -263,147 +86,13 @@ class OEAWInstitutionDetailView(LoginRequiredMixin, generic.DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        ids_akad = Institution.objects.filter(
-            akademie_institution=True,
-            label__in=AKADEMIE_INST_ROOT,
-        ).values_list("id", flat=True)
         context["entity_type"] = "institution"
-        context["branches"] = InstitutionHierarchie.objects.filter(
-            Q(
-                obj_object_id=self.object.id,
-                relation="hat Untereinheit",
-                subj_object_id__in=list(ids_akad),
-            )
-            | Q(
-                subj_object_id=self.object.id,
-                relation="ist Teil von",
-                obj_object_id__in=list(ids_akad),
-            )
-        ).annotate(
-            rel=Case(
-                When(subj_object_id=self.object.id, then=Value("forward")),
-                default=Value("reverse"),
-            )
-        )
-
-        list_struc = [
-            "hat Untereinheit",
-            "eingegliedert in",
-            "ist Teil von",
-            "gliedert ein",
-        ]
-        context["structure"] = (
-            InstitutionHierarchie.objects.filter(
-                Q(
-                    subj_object_id=self.object.id,
-                )
-                | Q(obj_object_id=self.object.id),
-                relation__in=list_struc,
-            )
-            .annotate(
-                rel=Case(
-                    When(subj_object_id=self.object.id, then=F("relation")),
-                    default=F("relation_reverse"),
-                ),
-                obj_id=Case(
-                    When(subj_object_id=self.object.id, then=F("obj_object_id")),
-                    default=F("subj_object_id"),
-                ),
-                obj_label=Case(
-                    When(
-                        subj_object_id=self.object.id,
-                        then=Subquery(
-                            Institution.objects.filter(
-                                pk=OuterRef("obj_object_id")
-                            ).values("label")[:1]
-                        ),
-                    ),
-                    default=Subquery(
-                        Institution.objects.filter(
-                            pk=OuterRef("subj_object_id")
-                        ).values("label")[:1]
-                    ),
-                ),
-            )
-            .exclude(subj_object_id__in=ids_akad)
-            .exclude(obj_object_id__in=ids_akad)
-            .order_by("beginn_date_sort")
-        )
-        suc_pre_lst = [
-            "umbenannt von",
-            "zusammengelegt mit",
-            "ist Vorgänger von",
-            "umgewandelt von",
-        ]
-        suc_pre_qs = (
-            InstitutionHierarchie.objects.filter(
-                Q(subj_object_id=self.object.id) | Q(obj_object_id=self.object.id),
-                relation__in=suc_pre_lst,
-            )
-            .annotate(
-                rel=Case(
-                    When(subj_object_id=self.object.id, then=F("relation")),
-                    default=F("relation_reverse"),
-                ),
-                rel_kind=Case(
-                    When(subj_object_id=self.object.id, then=Value("predecessor")),
-                    default=Value("successor"),
-                ),
-                obj_id=Case(
-                    When(subj_object_id=self.object.id, then=F("obj_object_id")),
-                    default=F("subj_object_id"),
-                ),
-                obj_label=Case(
-                    When(
-                        subj_object_id=self.object.id,
-                        then=Subquery(
-                            Institution.objects.filter(
-                                pk=OuterRef("obj_object_id")
-                            ).values("label")[:1]
-                        ),
-                    ),
-                    default=Subquery(
-                        Institution.objects.filter(
-                            pk=OuterRef("subj_object_id")
-                        ).values("label")[:1]
-                    ),
-                ),
+        context.update(
+            lazy_context(
+                lambda: load_institution_detail(self.object), INSTITUTION_DETAIL
             )
-            .exclude(obj_object_id__in=ids_akad)
         )
-
-        context["predecessors"] = suc_pre_qs.filter(rel_kind="predecessor").order_by(
-            "beginn_date_sort"
-        )
-        context["successors"] = suc_pre_qs.filter(rel_kind="successor").order_by(
-            "beginn_date_sort"
-        )
-        context["leaders"] = PositionAn.objects.filter(
-            obj_object_id=self.object.id,
-            position__in=[
-                "Obmann/Obfrau (Kommission)",
-                "Direktor(in)",
-                "Direktor(in) (Institut/Forschungstelle)",
-                "Vorsitzende(r)",
-                "Institutsdirektor(in)",
-                "interimistischer Leiter",
-                "kommissarische(r) Leiter(in)",
-            ],
-        ).order_by("beginn_date_sort")
-        context["deputies"] = PositionAn.objects.filter(
-            obj_object_id=self.object.id,
-            position__in=[
-                "1. Stellvertreter(in)",
-                "2. Stellvertreter(in)",
-                "Obmann/Obfrau-Stellvertreter(in)",
-                "stv. Leiter(in)",
-                "stv. Direktor(in)",
-            ],
-        ).order_by("beginn_date_sort")
-        context["members"] = PositionAn.objects.filter(
-            obj_object_id=self.object.id,
-            position__in=["Kommissionsmitglied", "Delegierte(r)", "Mitglied"],
-        ).order_by("beginn_date_sort")
+        context.update(fragment_cache_context(self.object))
         return context
 
 
@@ -416,12 +105,10 @@ class OEAWPrizeDetailView(LoginRequiredMixin, generic.DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["entity_type"] = "institution"
-        context["laureates"] = Gewinnt.objects.filter(
-            obj_object_id=self.object.id,
-        ).order_by("datum_date_sort")
-        context["awarded_by"] = WirdVergebenVon.objects.filter(
-            subj_object_id=self.object.id
-        ).order_by("beginn_date_sort")
+        context.update(
+            lazy_context(lambda: load_prize_detail(self.object), PRIZE_DETAIL)
+        )
+        context.update(fragment_cache_context(self.object))
         return context
 
 
@@ -455,9 +142,13 @@ class InstitutionIndexView(LoginRequiredMixin, TemplateView):
         return context
 
 
+@method_decorator(cache_response, name="get")
 class PersonResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTableView):
     table_class = SearchResultTable
     template_name = "mine_frontend/search_result.html"
+    keyset_pagination = True
+    facet_backend = BitsetFacetBackend(SEARCH_INDEX_VERSION)
+    page_annotations = {"memberships": F("search_index__memberships")}
 
     facet_fields = {
         "klasse": {
@@ -498,9 +189,10 @@ class PersonResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTableView)
             "label": "Suche",
             "param": "q",
             "lookups": [
-                ("unaccent__icontains", "search_labels"),
+                ("trigram", "search_name"),
             ],
             "type": "text",
+            "rank": True,
         },
         "vorschlagende": {
             "label": "Vorschlagende",
@@ -656,101 +348,16 @@ class PersonResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTableView)
     }
 
     def get_base_queryset(self):
-        """Get base queryset before any filtering"""
-        memb = (
-            OeawMitgliedschaft.objects.filter(subj_object_id=OuterRef("id"))
-            .values("mitgliedschaft")
-            .distinct()
-        )
-        memb_dates = OeawMitgliedschaft.objects.filter(subj_object_id=OuterRef("id"))
-        klasse_ids = Institution.objects.filter(
-            id=OuterRef("obj_object_id"), typ="Klasse"
-        ).values_list("id", flat=True)
-        insts_academy = Institution.objects.filter(
-            id=OuterRef("obj_object_id"), akademie_institution=True
-        ).values_list("id", flat=True)
-        func_presidium = (
-            PositionAn.objects.filter(
-                subj_object_id=OuterRef("id"),
-                position__in=POSITIONEN_PRES,
-            )
-            .annotate(academy_inst=Subquery(klasse_ids))
-            .filter(
-                academy_inst__isnull=False,
-            )
-            .values_list("position")
-            .distinct()
-        )
-        insts = (
-            PositionAn.objects.filter(subj_object_id=OuterRef("id"))
-            .annotate(academy_inst=Subquery(insts_academy))
-            .filter(academy_inst__isnull=False)
-            .values_list("obj_object_id", flat=True)
-            .distinct()
-        )
-        geburts_orte = GeborenIn.objects.filter(
-            subj_object_id=OuterRef("id")
-        ).values_list("obj_object_id", flat=True)
-        sterbe_orte = GestorbenIn.objects.filter(
-            subj_object_id=OuterRef("id")
-        ).values_list("obj_object_id", flat=True)
-        ausbildung_inst = AusbildungAn.objects.filter(
-            subj_object_id=OuterRef("id"),
-            typ__in=["Studium", "Promotion", "Habilitation"],
-        ).values_list("obj_object_id", flat=True)
-        nsdap_id = Institution.objects.filter(
-            label="Nationalsozialistische Deutsche Arbeiterpartei"
-        ).values_list("id", flat=True)
-        memb_nsdap = Mitglied.objects.filter(
-            subj_object_id=OuterRef("id"), obj_object_id=Subquery(nsdap_id[:1])
-        )
-        nobel_p = Preis.objects.filter(
-            name__in=[
-                "Nobelpreis für Chemie",
-                "Nobelpreis für Physik",
-                "Nobelpreis für Physiologie oder Medizin",
-                "Alfred-Nobel-Gedächtnispreis für Wirtschaftswissenschaften",
-                "Nobelpreis für Literatur",
-                "Friedensnobelpreis",
-            ]
-        ).values_list("id", flat=True)
-        nobelpreis = Gewinnt.objects.filter(
-            subj_object_id=OuterRef("pk"), obj_object_id__in=nobel_p
-        )
-        akademiepreise = Preis.objects.filter(academy_prize=True).values_list(
-            "id", flat=True
-        )
-        akadp_won = Gewinnt.objects.filter(
-            subj_object_id=OuterRef("pk"), obj_object_id__in=akademiepreise
-        ).values_list("obj_object_id", flat=True)
-        wiss_austausch = WissenschaftsaustauschIn.objects.filter(
-            subj_object_id=OuterRef("pk")
-        ).values_list("obj_object_id", flat=True)
-
-        p = Person.objects.filter(mitglied=True).annotate(
-            memberships=ArraySubquery(memb),
-            acad_func=ArraySubquery(func_presidium),
-            search_labels=Concat("forename", Value(" "), "surname"),
-            institute=ArraySubquery(insts),
-            geburtsorte=ArraySubquery(geburts_orte),
-            sterbeorte=ArraySubquery(sterbe_orte),
-            ausbildunginst=ArraySubquery(ausbildung_inst),
-            min_date_memb=Subquery(
-                memb_dates.order_by("beginn_date_from").values("beginn_date_from")[:1]
-            ),
-            max_date_memb=Subquery(
-                memb_dates.order_by("-ende_date_to").values("ende_date_to")[:1]
-            ),
-            nsdap=Case(
-                When(Exists(memb_nsdap), then=Value(True)), default=Value(False)
-            ),
-            nobelpreis=Case(
-                When(Exists(nobelpreis), then=Value(True)), default=Value(False)
-            ),
-            akademiepreise=ArraySubquery(akadp_won),
-            wiss_austausch=ArraySubquery(wiss_austausch),
+        """Get base queryset before any filtering
+
+        The per-person aggregates are read from `PersonSearchIndex`, which
+        is kept up to date by the signal handlers in `apis_ontology.signals`.
+        They are only joined in when a filter, facet or sort order uses them.
+        """
+        return Person.objects.filter(mitglied=True).alias(
+            search_name=search_names(),
+            **{field: F(f"search_index__{field}") for field in INDEX_FIELDS},
         )
-        return p
 
     def get_queryset(self):
         """Get the final filtered queryset for the table"""
@@ -762,9 +369,11 @@ class PersonResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTableView)
         return qs
 
 
+@method_decorator(cache_response, name="get")
 class InstitutionResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTableView):
     table_class = SearchResultInstitutionTable
     template_name = "mine_frontend/search_result.html"
+    keyset_pagination = True
 
     facet_fields = {
         "klasse": {
@@ -784,38 +393,23 @@ class InstitutionResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTable
     filter_fields = {
         "suche": {
             "label": "Suche",
-            "field": "label",
+            "field": "search_name",
             "param": "q",
-            "lookup": "unaccent__icontains",
+            "lookup": "trigram",
             "type": "text",
+            "rank": True,
         },
     }
 
     def get_base_queryset(self):
         """Get base queryset before any filtering"""
-        klasse_ids = Institution.objects.filter(typ="Klasse").values_list(
-            "id", flat=True
-        )
-
-        klasse_relation = (
-            InstitutionHierarchie.objects.filter(
-                Q(subj_object_id__in=klasse_ids, obj_object_id=OuterRef("pk"))
-                | Q(obj_object_id__in=klasse_ids, subj_object_id=OuterRef("pk"))
-            )
-            .annotate(
-                klasse_id=Case(
-                    When(subj_object_id__in=klasse_ids, then=F("subj_object_id")),
-                    default=F("obj_object_id"),
-                )
-            )
-            .values("klasse_id")[:1]
-        )
-
-        return Institution.objects.filter(akademie_institution=True).annotate(
-            klasse_id=Subquery(klasse_relation),
-            klasse_label=Subquery(
-                Institution.objects.filter(pk=OuterRef("klasse_id")).values("label")[:1]
-            ),
+        # the nearest Klasse above the institution, at any level
+        klasse = InstitutionClosure.objects.filter(
+            descendant=OuterRef("pk"), ancestor__typ="Klasse"
+        ).order_by("depth")
+        return Institution.objects.filter(akademie_institution=True).alias(
+            search_name=search_names(),
+            klasse_label=Subquery(klasse.values("ancestor__label")[:1]),
         )
 
     def get_queryset(self):
@@ -832,3 +426,19 @@ class InstitutionResultsView(FacetedSearchMixin, LoginRequiredMixin, SingleTable
         context = super().get_context_data(**kwargs)
         context["css_postfix"] = "-institutions"
         return context
+
+
+class CacheStatsView(LoginRequiredMixin, UserPassesTestMixin, generic.View):
+    """hit and miss counters of the search result caches, for staff only
+
+    With the `LocMemCache` of the default settings every worker process
+    has counters of its own, so these are those of the process answering.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {"per_process": isinstance(caches["default"], LocMemCache), **cache_stats()}
+        )